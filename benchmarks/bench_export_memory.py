@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Check that chunked (streamed) export keeps peak memory flat as the number
+of annotated pages grows. Each export runs in a fresh process and reports
+how much its peak RSS rose during export; the script exits with status 1
+if the largest document needs more than --tolerance MB over the smallest.
+bench_suite.py runs the same check (50 vs 800 pages) on every run.
+
+A single-pass export of 800 pages needs about 16 MB more than one of 50
+pages, while chunked exports stay within 2-4 MB of each other (allocator
+state varies between runs), which is what the default tolerance separates.
+
+Usage: python benchmarks/bench_export_memory.py [--pages 50,800]
+           [--backend reportlab] [--chunk-pages 64] [--tolerance 8]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import A4, make_synthetic_pdf, peak_rss, reset_peak_rss
+
+PAGES = (50, 800)
+TOLERANCE_MB = 8.0
+
+
+def run_child(source, pages, backend, chunk_pages):
+    """Export source with overlays on every page; print peak growth as JSON."""
+    from bench_overlay import make_signature, page_overlay
+
+    import pdf_editor_with_textboxes as editor
+
+    tmp = os.path.dirname(source)
+    sign_png = make_signature(os.path.join(tmp, "sign.png"))
+    stream = editor.SIGNATURE_ASSETS.stream(sign_png)
+
+    exporter = editor.PDFExporter(source, os.path.join(tmp, "out.pdf"), backend=backend,
+                                  chunk_pages=chunk_pages)
+    for page_num in range(pages):
+        text_boxes, image = page_overlay(page_num, sign_png)
+        exporter.add_text_boxes(page_num, text_boxes)
+        exporter.add_image(page_num, *image, stream=stream)
+
+    reset_peak_rss()
+    before = peak_rss()
+    exporter.export()
+    print(json.dumps({'growth': peak_rss() - before}))
+
+
+def measure_growth(source, pages, backend, chunk_pages):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", source,
+         "--pages", str(pages), "--backend", backend, "--chunk-pages", str(chunk_pages)],
+        check=True, stdout=subprocess.PIPE, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])['growth']
+
+
+def export_growth(page_counts, backend="reportlab", chunk_pages=64):
+    """{pages: peak RSS growth in MB} for synthetic documents of each size."""
+    growth = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            source = make_synthetic_pdf(os.path.join(tmp, f"source_{pages}.pdf"),
+                                        pages=pages, page_size=A4, text_lines=20, images=1)
+            growth[pages] = measure_growth(source, pages, backend, chunk_pages) / 2**20
+    return growth
+
+
+def spread(growth):
+    """Largest minus smallest peak growth, in MB."""
+    return max(growth.values()) - min(growth.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", default=",".join(map(str, PAGES)),
+                        help="comma-separated page counts")
+    parser.add_argument("--backend", default="reportlab")
+    parser.add_argument("--chunk-pages", type=int, default=64,
+                        help="pages per incremental save; 1000000 = single pass")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_MB,
+                        help="allowed peak growth difference in MB")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, int(args.pages), args.backend, args.chunk_pages)
+        return 0
+
+    page_counts = [int(n) for n in args.pages.split(",")]
+    growth = export_growth(page_counts, args.backend, args.chunk_pages)
+    for pages, mb in growth.items():
+        print(f"{pages:>6} pages ({args.backend}, chunks of {args.chunk_pages})"
+              f"   peak growth {mb:8.1f} MB")
+
+    flat = spread(growth) <= args.tolerance
+    print(f"spread {spread(growth):.1f} MB (tolerance {args.tolerance:.0f} MB): "
+          f"{'flat' if flat else 'NOT flat'}")
+    return 0 if flat else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
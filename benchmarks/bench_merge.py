@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark mail merge throughput: one filled PDF per data row from a
+synthetic template with {{column}} placeholders. Compares a fresh
+PDFExporter per row with MergeTemplate (source prepared once) in this
+process and across worker processes.
+
+Usage: python benchmarks/bench_merge.py [--rows 200] [--pages 20]
+           [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from common import A4, make_synthetic_pdf
+
+import pdf_editor_with_textboxes as editor
+
+FIELD_PAGES = (0, 1, -1)  # pages with placeholder boxes; -1 = last page
+
+
+def make_layout(pages):
+    """Text boxes: a few placeholders and a static line per field page."""
+    layout = {}
+    for page in FIELD_PAGES:
+        page_num = page % pages
+        layout[page_num] = [
+            {'text': "Dear {{name}},", 'x': 72, 'y': 90, 'font_family': 'Helvetica',
+             'font_size': 14},
+            {'text': "Customer no. {{id}} - amount due {{amount}} EUR", 'x': 72, 'y': 120,
+             'font_family': 'Times-Roman', 'font_size': 11},
+            {'text': "This letter was generated automatically.", 'x': 72, 'y': 780,
+             'font_family': 'Helvetica', 'font_size': 9},
+        ]
+    return layout
+
+
+def make_rows(count):
+    return [
+        {'id': str(1000 + n), 'name': f"Customer {n}", 'amount': f"{n * 3.5:.2f}"}
+        for n in range(count)
+    ]
+
+
+def naive_merge(source, layout, rows, output_paths):
+    """A fresh PDFExporter per row, substituting placeholders first."""
+    for row, output_path in zip(rows, output_paths):
+        exporter = editor.PDFExporter(source, output_path)
+        for page_num, text_boxes in layout.items():
+            exporter.add_text_boxes(page_num, [
+                dict(tb, text=editor.merge_substitute(tb['text'], row)) for tb in text_boxes
+            ])
+        exporter.export()
+
+
+def report(name, rows, seconds):
+    print(f"{name:<40} {rows / seconds:8.1f} rows/s   "
+          f"{seconds / rows * 1000:7.2f} ms/row", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=editor.BATCH_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_synthetic_pdf(os.path.join(tmp, "template.pdf"),
+                                    pages=args.pages, page_size=A4, text_lines=40, images=1)
+        layout = make_layout(args.pages)
+        rows = make_rows(args.rows)
+        output_paths = editor.merge_output_names(
+            "{{_row}}.pdf", rows, os.path.join(tmp, "out"))
+        os.makedirs(os.path.join(tmp, "out"))
+
+        start = time.perf_counter()
+        naive_merge(source, layout, rows, output_paths)
+        report("PDFExporter per row", len(rows), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        template = editor.MergeTemplate(source, layout)
+        prepare = time.perf_counter() - start
+        print(f"{'prepare template':<40} {prepare * 1000:8.1f} ms", flush=True)
+
+        start = time.perf_counter()
+        editor.run_merge(template, rows, output_paths, workers=1)
+        report("MergeTemplate, 1 worker", len(rows), time.perf_counter() - start)
+
+        if args.workers > 1:
+            start = time.perf_counter()
+            results = editor.run_merge(template, rows, output_paths, workers=args.workers)
+            report(f"MergeTemplate, {args.workers} workers", len(rows),
+                   time.perf_counter() - start)
+            failed = sum(not result['ok'] for result in results)
+            if failed:
+                print(f"{failed} rows failed")
+
+
+if __name__ == "__main__":
+    main()
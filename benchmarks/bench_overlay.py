@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark overlay export on a 200-page document with text boxes and a
+signature on every page: native PyMuPDF drawing vs. batched reportlab,
+plus the old per-page reportlab canvas + PyPDF2 merge_page path when
+PyPDF2 is installed.
+
+Usage: python benchmarks/bench_overlay.py [--pages 200] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import tempfile
+
+from common import A4, make_synthetic_pdf, measure, print_result
+
+import fitz  # PyMuPDF
+
+import pdf_editor_with_textboxes as editor
+
+
+def make_signature(path):
+    """Write a small RGBA PNG to use as signature."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 300, 120), True)
+    pix.clear_with(0)
+    pix.set_rect(fitz.IRect(20, 50, 280, 70), (20, 20, 120, 255))
+    pix.save(path)
+    return path
+
+
+def page_overlay(page_num, sign_png):
+    text_boxes = [
+        {'text': f"Field {n} on page {page_num + 1}", 'x': 72, 'y': 100 + n * 40,
+         'font_family': 'Helvetica', 'font_size': 12}
+        for n in range(3)
+    ]
+    image = (sign_png, 350, 700, 150, 60)
+    return text_boxes, image
+
+
+def export(source, output, pages, sign_png, backend, full_rewrite=False):
+    stream = editor.SIGNATURE_ASSETS.stream(sign_png)
+    exporter = editor.PDFExporter(source, output, full_rewrite=full_rewrite, backend=backend)
+    for page_num in range(pages):
+        text_boxes, image = page_overlay(page_num, sign_png)
+        exporter.add_text_boxes(page_num, text_boxes)
+        exporter.add_image(page_num, *image, stream=stream)
+    exporter.export()
+
+
+def count_images(path):
+    """Number of image XObjects stored in a PDF."""
+    doc = fitz.open(path)
+    count = sum(
+        1 for xref in range(1, doc.xref_length())
+        if doc.xref_get_key(xref, "Subtype")[1] == "/Image"
+    )
+    doc.close()
+    return count
+
+
+def export_legacy(source, output, pages, sign_png):
+    """Previous exporter: one reportlab canvas, parse and merge per page."""
+    from PyPDF2 import PdfReader, PdfWriter
+    from reportlab.pdfgen import canvas
+
+    reader = PdfReader(source)
+    writer = PdfWriter()
+    for page_num, page in enumerate(reader.pages):
+        width = float(page.mediabox[2])
+        height = float(page.mediabox[3])
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet, pagesize=(width, height))
+        text_boxes, (path, x, y, w, h) = page_overlay(page_num, sign_png)
+        editor.draw_overlay_reportlab(
+            c, width, height, text_boxes,
+            [{'path': path, 'x': x, 'y': y, 'width': w, 'height': h}]
+        )
+        c.save()
+        packet.seek(0)
+        page.merge_page(PdfReader(packet).pages[0])
+        writer.add_page(page)
+    with open(output, "wb") as f:
+        writer.write(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_synthetic_pdf(os.path.join(tmp, "source.pdf"), pages=args.pages,
+                                    page_size=A4, text_lines=40, images=1)
+        sign_png = make_signature(os.path.join(tmp, "sign.png"))
+        output = os.path.join(tmp, "out.pdf")
+        print(f"{args.pages} pages, overlays on every page")
+
+        for backend in ("native", "reportlab"):
+            samples = measure(lambda: export(source, output, args.pages, sign_png, backend),
+                              repeat=args.repeat)
+            print_result(f"{backend} (incremental)", samples)
+            print(f"{'':<40} output {os.path.getsize(output) / 1e6:.2f} MB, "
+                  f"{count_images(output)} image XObjects")
+
+        samples = measure(lambda: export(source, output, args.pages, sign_png, "native", True),
+                          repeat=args.repeat)
+        print_result("native (full rewrite)", samples)
+
+        try:
+            import PyPDF2  # noqa: F401
+        except ImportError:
+            print("PyPDF2 not installed - skipping legacy merge_page path")
+        else:
+            samples = measure(lambda: export_legacy(source, output, args.pages, sign_png),
+                              repeat=args.repeat, warmup=0)
+            print_result("legacy reportlab + merge_page", samples)
+            print(f"{'':<40} output {os.path.getsize(output) / 1e6:.2f} MB, "
+                  f"{count_images(output)} image XObjects")
+
+
+if __name__ == "__main__":
+    main()
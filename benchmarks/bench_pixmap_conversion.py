@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark fitz.Pixmap -> QPixmap conversion:
+PNG encode/decode round trip vs. wrapping the raw samples in a QImage.
+
+Usage: python benchmarks/bench_pixmap_conversion.py [--zoom 2] [--repeat 20]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import A4, make_synthetic_pdf, measure, print_result
+
+import fitz  # PyMuPDF
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPixmap
+
+import pdf_editor_with_textboxes as editor
+
+
+def png_round_trip(pix):
+    """Previous conversion path."""
+    pixmap = QPixmap()
+    pixmap.loadFromData(pix.tobytes("png"))
+    return pixmap
+
+
+def raw_samples(pix):
+    """Current path: render_page_samples() output -> QImage -> QPixmap."""
+    pix = editor.qimage_compatible(pix)
+    image = editor.samples_to_qimage(pix.samples, pix.width, pix.height, pix.stride,
+                                     pix.n, pix.alpha)
+    return QPixmap.fromImage(image)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--zoom", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_synthetic_pdf(os.path.join(tmp, "a4.pdf"), pages=1,
+                                      page_size=A4, text_lines=60, images=4)
+        doc = fitz.open(pdf_path)
+        pix = doc[0].get_pixmap(matrix=fitz.Matrix(args.zoom, args.zoom))
+        print(f"A4 page at {args.zoom}x: {pix.width}x{pix.height}, "
+              f"{len(pix.samples_mv) / 1e6:.1f} MB of samples")
+
+        png = measure(lambda: png_round_trip(pix), repeat=args.repeat)
+        raw = measure(lambda: raw_samples(pix), repeat=args.repeat)
+
+        print_result("PNG encode + loadFromData", png)
+        print_result("raw samples -> QImage -> QPixmap", raw)
+        print(f"speedup: {sum(png) / sum(raw):.1f}x")
+        doc.close()
+
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
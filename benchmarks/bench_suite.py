@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the render, navigation, persistence and export paths:
+PDFGraphicsView.load_pdf_page, ThumbnailWidget.load_thumbnails,
+FontDetector.detect_font_properties, SettingsManager and
+MainWindow.save_signed_pdf, on synthetic documents of varying page count,
+page size, text density and images.
+
+Each scenario runs headless in a fresh process with its own render cache
+and annotation database, so its peak RSS is its own and nothing is warm
+from a previous run. Reports latency percentiles, throughput and peak
+memory, and compares them with a baseline file: the script exits with
+status 1 if a figure grew by more than --tolerance. Baselines are machine
+specific; record one with --update-baseline where the comparison runs.
+
+Every run also checks that chunked export keeps peak memory flat as the
+page count grows (see bench_export_memory.py); this needs no baseline.
+
+Usage: python benchmarks/bench_suite.py [--docs a4-sparse,a0-large]
+           [--scenarios page_load,save_signed_pdf] [--repeat 3]
+           [--baseline benchmarks/baseline.json] [--update-baseline]
+           [--tolerance 0.5] [--export-memory-pages 50,800]
+           [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import bench_export_memory
+from common import A0, A4, make_synthetic_pdf, peak_rss, reset_peak_rss, summarize
+
+from PyQt5.QtCore import QPoint, QPointF, Qt
+from PyQt5.QtWidgets import QApplication
+
+import pdf_editor_with_textboxes as editor
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DOCUMENTS = {
+    # name: (pages, page size, text lines per page, images per page)
+    'a4-sparse': (10, A4, 10, 0),
+    'a4-dense': (10, A4, 80, 4),
+    'a4-long': (200, A4, 40, 1),
+    'a0-large': (4, A0, 60, 2),
+}
+NAV_PAGES = 8          # Pages visited per page_load pass
+BOXES_PER_PAGE = 20    # Text boxes per page for persistence and export
+WAIT_TIMEOUT = 120.0   # Seconds before a render or export counts as hung
+LATENCY_KEYS = ('p50_ms', 'p95_ms')
+MEMORY_KEYS = ('peak_rss_mb', 'workers_peak_rss_mb')
+
+
+class Results:
+    """Samples and units processed per metric, collected by a scenario."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, seconds, units=1, unit="pages"):
+        metric = self.metrics.setdefault(name, {'unit': unit, 'units': 0, 'samples': []})
+        metric['samples'].append(seconds)
+        metric['units'] += units
+
+    @contextmanager
+    def timed(self, name, units=1, unit="pages"):
+        start = time.perf_counter()
+        yield
+        self.add(name, time.perf_counter() - start, units, unit)
+
+
+class Context:
+    """What a scenario runs against, inside the child process."""
+
+    def __init__(self, app, source, workdir, repeat):
+        self.app = app
+        self.source = source
+        self.workdir = workdir
+        self.repeat = repeat
+        self.page_count = editor.DOCUMENT_POOL.page_count(source)
+        self.render_cache_dir = os.path.join(workdir, "render_cache")
+
+        # Keep the user's caches and annotations out of the measurements
+        editor.DISK_RENDER_CACHE = editor.DiskRenderCache(self.render_cache_dir)
+        editor.ANNOTATION_STORE = editor.AnnotationStore(
+            os.path.join(workdir, "annotations.sqlite3"))
+
+    def clear_disk_cache(self):
+        shutil.rmtree(self.render_cache_dir, ignore_errors=True)
+
+    def wait_until(self, predicate, timeout=WAIT_TIMEOUT):
+        """Process Qt events until predicate() is true."""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("timed out waiting for the event loop")
+            self.app.processEvents()
+            time.sleep(0.0005)
+
+    def settle(self):
+        """Wait for queued renders (e.g. prefetches) to finish."""
+        pool = editor.RenderWorkerPool.shared()
+        self.wait_until(lambda: not pool._futures)
+
+    def warm_up_workers(self):
+        """Start the render workers so process spawn is not measured."""
+        pool = editor.RenderWorkerPool.shared()
+        for worker in range(pool.max_workers):
+            pool.submit(self, ("warm-up", worker), self.source,
+                        worker % self.page_count, editor.PLACEHOLDER_ZOOM)
+        self.settle()
+
+
+def text_boxes(page_num):
+    """BOXES_PER_PAGE text box dicts as the GUI stores them."""
+    return [
+        {'text': f"Field {n} on page {page_num + 1}", 'x': 72, 'y': 60 + n * 30,
+         'width': 200, 'height': 24, 'font_family': 'Helvetica', 'font_size': 11}
+        for n in range(BOXES_PER_PAGE)
+    ]
+
+
+# ==================== Scenarios ====================
+def bench_page_load(ctx, results):
+    """Page switches until the full render is shown: first visit, then revisit."""
+    ctx.warm_up_workers()
+    pages = range(min(NAV_PAGES, ctx.page_count))
+    for _ in range(ctx.repeat):
+        ctx.clear_disk_cache()
+        editor.FontDetector._stats_cache.clear()
+        view = editor.PDFGraphicsView()
+        view.resize(1000, 800)
+        view.show()
+        ctx.app.processEvents()
+
+        for name in ("page_load.cold", "page_load.cached"):
+            for page_num in pages:
+                with results.timed(name):
+                    view.load_pdf_page(ctx.source, page_num)
+                    ctx.wait_until(lambda: view._page_key in view.render_cache)
+
+        editor.RenderWorkerPool.shared().cancel_except(view)
+        ctx.settle()
+        view.close()
+        view.deleteLater()
+        ctx.app.processEvents()
+
+
+def visible_rows(widget):
+    """Rows currently in the thumbnail list's viewport."""
+    model = widget.thumbnail_model
+    first = widget.indexAt(QPoint(5, 5)).row()
+    if first < 0:
+        return []
+    last = widget.indexAt(QPoint(5, widget.viewport().height() - 5)).row()
+    if last < 0:
+        last = model.rowCount() - 1
+    return list(range(first, last + 1))
+
+
+def bench_thumbnails(ctx, results):
+    """load_thumbnails until every row in the viewport shows its thumbnail."""
+    ctx.warm_up_workers()
+    for _ in range(ctx.repeat):
+        ctx.clear_disk_cache()
+        widget = editor.ThumbnailWidget()
+        widget.resize(120, 800)
+        widget.show()
+        ctx.app.processEvents()
+        model = widget.thumbnail_model
+
+        def painted():
+            rows = visible_rows(widget)
+            return rows and all(
+                model.data(model.index(row), Qt.DecorationRole) is not None for row in rows)
+
+        start = time.perf_counter()
+        widget.load_thumbnails(ctx.source)
+        ctx.wait_until(painted)
+        results.add("thumbnails.visible", time.perf_counter() - start,
+                    len(visible_rows(widget)), "thumbnails")
+
+        editor.RenderWorkerPool.shared().cancel_except(model)
+        ctx.settle()
+        widget.close()
+        widget.deleteLater()
+        ctx.app.processEvents()
+
+
+def bench_font_detection(ctx, results):
+    """detect_font_properties on every page: uncached, then memoized."""
+    for _ in range(ctx.repeat):
+        editor.FontDetector._stats_cache.clear()
+        for name in ("font_detect.cold", "font_detect.cached"):
+            for page_num in range(ctx.page_count):
+                with results.timed(name):
+                    editor.FontDetector.detect_font_properties(ctx.source, page_num)
+
+
+def bench_settings(ctx, results):
+    """SettingsManager text box and UI state persistence."""
+    settings = editor.SettingsManager
+    pages = {page_num: text_boxes(page_num) for page_num in range(ctx.page_count)}
+    for run in range(ctx.repeat):
+        document_id = f"bench-{run}"
+        for page_num, boxes in pages.items():
+            with results.timed("settings.save_page"):
+                if not settings.save_text_boxes_from_dicts(boxes, page_num, document_id):
+                    raise RuntimeError("saving text boxes failed")
+        for page_num in pages:
+            with results.timed("settings.load_page"):
+                settings.load_text_boxes(page_num, document_id)
+        with results.timed("settings.load_document", ctx.page_count):
+            loaded = settings.load_text_boxes(document_id=document_id)
+        if len(loaded) != len(pages):
+            raise RuntimeError(f"loaded {len(loaded)} of {len(pages)} pages")
+        with results.timed("settings.state", unit="states"):
+            settings.save_state(120, QPointF(300, 600), 1.0, 0, ctx.page_count, document_id)
+            settings.load_state(document_id)
+
+
+def bench_save_signed_pdf(ctx, results):
+    """save_signed_pdf end to end (export process), and the export alone."""
+    from bench_overlay import make_signature
+
+    editor.PDF_PATH = ctx.source
+    editor.OUTPUT_PATH = os.path.join(ctx.workdir, "signed.pdf")
+    editor.SIGN_PNG = make_signature(os.path.join(ctx.workdir, "sign.png"))
+    document_id = editor.DOCUMENT_POOL.fingerprint(ctx.source)
+    editor.ANNOTATION_STORE.save_pages(
+        document_id, {page_num: text_boxes(page_num) for page_num in range(ctx.page_count)})
+
+    # Nobody is there to close message boxes; collect them instead
+    messages = []
+    editor.QMessageBox.information = lambda parent, title, text, *args: messages.append(
+        (title, text))
+    editor.QMessageBox.critical = editor.QMessageBox.information
+
+    window = editor.MainWindow()
+    window.show()
+    ctx.app.processEvents()
+    for _ in range(ctx.repeat):
+        with results.timed("save_signed_pdf", ctx.page_count):
+            window.save_signed_pdf()
+            ctx.wait_until(lambda: not window.export_worker.is_running())
+        with results.timed("export.in_process", ctx.page_count):
+            window.build_exporter(signature=True).export()
+        errors = [text for title, text in messages if title != "Success"]
+        if errors or not os.path.exists(editor.OUTPUT_PATH):
+            raise RuntimeError(f"export failed: {errors}")
+
+    window.close()
+    ctx.app.processEvents()
+
+
+SCENARIOS = {
+    'page_load': bench_page_load,
+    'thumbnails': bench_thumbnails,
+    'font_detect': bench_font_detection,
+    'settings': bench_settings,
+    'save_signed_pdf': bench_save_signed_pdf,
+}
+
+
+# ==================== Runner ====================
+def run_child(scenario, source, workdir, repeat):
+    """Run one scenario and print its samples and peak memory as JSON."""
+    reset_peak_rss()  # Do not report the parent's peak (inherited on Linux)
+    app = QApplication([])
+    results = Results()
+    SCENARIOS[scenario](Context(app, source, workdir, repeat), results)
+
+    # Join the worker processes so RUSAGE_CHILDREN includes them
+    editor.RenderWorkerPool.shared().shutdown()
+    print(json.dumps({
+        'metrics': results.metrics,
+        'peak_rss': peak_rss(),
+        'workers_peak_rss': peak_rss(children=True),
+    }))
+
+
+def run_scenario(scenario, source, workdir, repeat):
+    os.makedirs(workdir)
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", scenario, "--source", source,
+         "--workdir", workdir, "--repeat", str(repeat)],
+        check=True, stdout=subprocess.PIPE, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def collect(doc_name, scenario, child, report):
+    """Summarize a child's output into report and print it."""
+    for name, metric in child['metrics'].items():
+        stats = summarize(metric['samples'])
+        stats['samples'] = len(metric['samples'])
+        stats['throughput'] = metric['units'] / sum(metric['samples'])
+        stats['unit'] = f"{metric['unit']}/s"
+        key = f"{doc_name}/{name}"
+        report['latency'][key] = stats
+        print(f"{key:<36} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+              f"p99 {stats['p99_ms']:8.2f} ms  {stats['throughput']:9.1f} {stats['unit']}",
+              flush=True)
+
+    key = f"{doc_name}/{scenario}"
+    memory = {
+        'peak_rss_mb': child['peak_rss'] / 2**20,
+        'workers_peak_rss_mb': child['workers_peak_rss'] / 2**20,
+    }
+    report['memory'][key] = memory
+    print(f"{key:<36} peak RSS {memory['peak_rss_mb']:6.0f} MB  "
+          f"workers {memory['workers_peak_rss_mb']:6.0f} MB", flush=True)
+
+
+def compare(report, baseline, tolerance, min_delta_ms, min_delta_mb):
+    """Return regression messages for figures that grew past the tolerance."""
+    checks = [('latency', LATENCY_KEYS, min_delta_ms, "ms"),
+              ('memory', MEMORY_KEYS, min_delta_mb, "MB")]
+    regressions = []
+    for section, keys, min_delta, unit in checks:
+        for name, current in report[section].items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for key in keys:
+                old, new = previous[key], current[key]
+                if new > old * (1 + tolerance) and new - old > min_delta:
+                    regressions.append(
+                        f"{name} {key}: {new:.1f} {unit} (baseline {old:.1f} {unit})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", default=",".join(DOCUMENTS),
+                        help="comma-separated documents: " + ", ".join(DOCUMENTS))
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenarios: " + ", ".join(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed growth over the baseline (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="latency changes below this are noise")
+    parser.add_argument("--min-delta-mb", type=float, default=16.0,
+                        help="memory changes below this are noise")
+    parser.add_argument("--export-memory-pages",
+                        default=",".join(map(str, bench_export_memory.PAGES)),
+                        help="page counts whose export peak memory must match ('' skips)")
+    parser.add_argument("--export-memory-tolerance", type=float,
+                        default=bench_export_memory.TOLERANCE_MB,
+                        help="allowed export peak growth difference in MB")
+    parser.add_argument("--output", help="also write the results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.source, args.workdir, args.repeat)
+        return 0
+
+    docs = args.docs.split(",")
+    scenarios = args.scenarios.split(",")
+    for name in docs:
+        if name not in DOCUMENTS:
+            parser.error(f"unknown document: {name}")
+    for name in scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+
+    report = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': f"{platform.machine()} {platform.system()} {os.cpu_count()} CPUs",
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'latency': {},
+        'memory': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for doc_name in docs:
+            pages, page_size, text_lines, images = DOCUMENTS[doc_name]
+            source = make_synthetic_pdf(os.path.join(tmp, f"{doc_name}.pdf"), pages=pages,
+                                        page_size=page_size, text_lines=text_lines,
+                                        images=images)
+            for scenario in scenarios:
+                child = run_scenario(scenario, source,
+                                     os.path.join(tmp, f"{doc_name}-{scenario}"), args.repeat)
+                collect(doc_name, scenario, child, report)
+
+    failures = []
+    if args.export_memory_pages:
+        page_counts = [int(n) for n in args.export_memory_pages.split(",")]
+        growth = bench_export_memory.export_growth(page_counts)
+        report['export_memory'] = {str(pages): mb for pages, mb in growth.items()}
+        for pages, mb in growth.items():
+            print(f"{'export_memory/' + str(pages) + ' pages':<36} peak growth {mb:6.1f} MB",
+                  flush=True)
+        spread = bench_export_memory.spread(growth)
+        if spread > args.export_memory_tolerance:
+            failures.append(f"export peak memory grows with page count: {spread:.1f} MB "
+                            f"(tolerance {args.export_memory_tolerance:.0f} MB)")
+    for message in failures:
+        print(f"FAILED {message}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 1 if failures else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+        return 1 if failures else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance, args.min_delta_ms,
+                          args.min_delta_mb)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    print(f"{len(regressions)} regressions (tolerance {args.tolerance:.0%} "
+          f"over {baseline.get('created', 'baseline')})")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark a page scene with many text boxes: the painted PDFTextBoxItem
+vs. the previous QGraphicsProxyWidget + PDFTextWidget per box. Measures
+populating the scene, a full viewport paint and scroll steps.
+
+Usage: python benchmarks/bench_text_boxes.py [--boxes 1000] [--steps 40]
+"""
+
+import argparse
+import time
+
+from common import print_result
+
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QTransform
+from PyQt5.QtWidgets import QApplication, QGraphicsProxyWidget, QGraphicsScene, QGraphicsView
+
+import pdf_editor_with_textboxes as editor
+
+PAGE_SIZE = (595, 842)  # A4 in PDF points (scene units)
+BOX_SIZE = (100, 30)   # Box size in points: 200 x 60 pixels at 100% zoom
+VIEW_SIZE = (1000, 800)
+
+
+def make_legacy_box(text):
+    """The previous text box: a proxy widget embedding a QTextEdit."""
+    item = QGraphicsProxyWidget()
+    widget = editor.PDFTextWidget(text, "Helvetica", 12)
+    widget.resize(200, 60)
+    item.setWidget(widget)
+    item.setScale(1 / editor.VIEW_SCALE)
+    return item
+
+
+def make_box(text):
+    item = editor.PDFTextBoxItem(text, "Helvetica", 12)
+    item.resize(200, 60)
+    return item
+
+
+def populate(scene, factory, count):
+    columns = 25
+    rows = max(1, (count + columns - 1) // columns)
+    for index in range(count):
+        item = factory(f"Field {index}\nvalue {index * 7}")
+        item.setPos(QPointF(
+            (index % columns) * (PAGE_SIZE[0] - BOX_SIZE[0]) / columns,
+            (index // columns) * (PAGE_SIZE[1] - BOX_SIZE[1]) / rows
+        ))
+        scene.addItem(item)
+
+
+def run(app, name, factory, boxes, steps):
+    scene = QGraphicsScene(0, 0, *PAGE_SIZE)
+    view = QGraphicsView(scene)
+    view.setTransform(QTransform.fromScale(editor.VIEW_SCALE, editor.VIEW_SCALE))
+    view.resize(*VIEW_SIZE)
+    view.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    populate(scene, factory, boxes)
+    app.processEvents()
+    print_result(f"{name}: populate {boxes} boxes", [time.perf_counter() - start])
+
+    paints = []
+    for _ in range(5):
+        start = time.perf_counter()
+        view.viewport().repaint()
+        paints.append(time.perf_counter() - start)
+    print_result(f"{name}: full repaint", paints)
+
+    scroll_bar = view.verticalScrollBar()
+    step = max(1, (scroll_bar.maximum() - scroll_bar.minimum()) // steps)
+    scrolls = []
+    for index in range(steps):
+        start = time.perf_counter()
+        scroll_bar.setValue(scroll_bar.minimum() + (index * step if index % 2 == 0 else 0))
+        view.viewport().repaint()
+        scrolls.append(time.perf_counter() - start)
+    print_result(f"{name}: scroll step", scrolls)
+
+    view.close()
+    scene.clear()
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boxes", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="only measure the painted item")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    run(app, "painted item", make_box, args.boxes, args.steps)
+    if not args.skip_legacy:
+        run(app, "proxy widget (legacy)", make_legacy_box, args.boxes, args.steps)
+
+
+if __name__ == "__main__":
+    main()
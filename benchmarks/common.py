@@ -0,0 +1,127 @@
+"""
+Shared helpers for the benchmark scripts.
+Synthetic PDF generation and simple timing statistics.
+"""
+
+import os
+import resource
+import sys
+import time
+
+# Run Qt without a display and make the editor module importable
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+A4 = (595, 842)
+A0 = (2384, 3370)
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do "
+    "eiusmod tempor incididunt ut labore et dolore magna aliqua."
+)
+
+
+def make_synthetic_pdf(path, pages=10, page_size=A4, text_lines=40, images=0):
+    """Write a synthetic PDF and return its path.
+
+    Args:
+        path: Output file path
+        pages: Number of pages
+        page_size: (width, height) in points
+        text_lines: Lines of text per page (text density)
+        images: Number of embedded raster images per page
+    """
+    width, height = page_size
+    doc = fitz.open()
+
+    image_stream = None
+    if images:
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 256, 256), False)
+        pix.set_rect(pix.irect, (200, 120, 40))
+        image_stream = pix.tobytes("png")
+
+    for page_num in range(pages):
+        page = doc.new_page(width=width, height=height)
+        line_height = max((height - 72) / max(text_lines, 1), 8)
+        for line in range(text_lines):
+            page.insert_text(
+                (36, 36 + line * line_height),
+                f"{page_num + 1}.{line + 1} {LOREM}",
+                fontsize=min(10, line_height * 0.8)
+            )
+        for index in range(images):
+            x = 36 + (index % 4) * 130
+            y = height / 2 + (index // 4) * 130
+            page.insert_image(fitz.Rect(x, y, x + 120, y + 120), stream=image_stream)
+
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def measure(func, repeat=10, warmup=1):
+    """Call func repeatedly and return the wall-clock samples in seconds."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Return mean/p50/p95/p99 in milliseconds."""
+    return {
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def peak_rss(children=False):
+    """Peak RSS in bytes of this process, or of its largest waited-for child."""
+    if not children:
+        try:
+            # Unlike ru_maxrss, VmHWM follows reset_peak_rss()
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss():
+    """Restart peak RSS tracking at the current RSS (Linux only).
+
+    A process started by subprocess inherits its parent's ru_maxrss on
+    Linux, so without this a child's peak can never be below the parent's.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def print_result(name, samples):
+    """Print one benchmark line."""
+    stats = summarize(samples)
+    print(f"{name:<40} mean {stats['mean_ms']:8.2f} ms   "
+          f"p50 {stats['p50_ms']:8.2f} ms   p95 {stats['p95_ms']:8.2f} ms")
@@ -6,22 +6,42 @@ Add text boxes with PDF-matched font styles
 
 import sys
 import os
+import argparse
+import csv
 import json
+import hashlib
+import math
+import multiprocessing
+import queue
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import traceback
+import zlib
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QScrollArea, QSplitter, QListWidget,
-    QListWidgetItem, QFrame, QFileDialog, QMessageBox, QStatusBar,
+    QPushButton, QLabel, QScrollArea, QSplitter, QListView,
+    QStyledItemDelegate, QStyle, QFrame, QFileDialog, QMessageBox, QStatusBar,
     QToolBar, QAction, QGraphicsView, QGraphicsScene,
-    QGraphicsPixmapItem, QGraphicsItem, QGraphicsTextItem, QGraphicsProxyWidget,
-    QMenu, QFontDialog, QInputDialog, QTextEdit
+    QGraphicsPixmapItem, QGraphicsItem, QGraphicsObject, QGraphicsTextItem,
+    QGraphicsProxyWidget, QMenu, QFontDialog, QInputDialog, QTextEdit
+)
+from PyQt5.QtCore import (
+    Qt, QObject, QEvent, QPoint, QPointF, QRect, QRectF, pyqtSignal, QTimer, QSize,
+    QAbstractListModel, QModelIndex
 )
-from PyQt5.QtCore import Qt, QPoint, QRectF, pyqtSignal, QTimer, QSize
 from PyQt5.QtGui import (
-    QImage, QPixmap, QPainter, QPen, QColor, QIcon, QFont,
-    QWheelEvent, QCursor, QTextDocument
+    QImage, QPixmap, QPainter, QPen, QColor, QFont,
+    QWheelEvent, QCursor, QTextDocument, QTransform, QStaticText, QFontMetricsF
 )
-from PyPDF2 import PdfReader, PdfWriter
 import fitz  # PyMuPDF
 import io
 from reportlab.pdfgen import canvas
@@ -36,73 +56,897 @@ SIGN_PNG = "/home/user/下载/nice_pdf_folder/Sign.png"
 OUTPUT_PATH = "/home/user/下载/nice_pdf_folder/xxx_signed.pdf"
 STATE_FILE = "/home/user/下载/nice_pdf_folder/ui_state.json"
 TEXT_BOXES_FILE = "/home/user/下载/nice_pdf_folder/text_boxes.json"
+CACHE_DIR = "/home/user/下载/nice_pdf_folder/.render_cache"
+ANNOTATION_DB = "/home/user/下载/nice_pdf_folder/annotations.sqlite3"
+DEFAULT_DOCUMENT_ID = "default"          # Annotation set used by the GUI
+
+# Rendering
+RENDER_ZOOM = 2                          # Page render scale (2x = 144 DPI); tiles add detail above it
+VIEW_SCALE = 2                           # Screen pixels per PDF point at 100% zoom
+LEGACY_SCENE_ZOOM = 2                    # Scene pixels per point in data saved before page-space coordinates
+RENDER_CACHE_BYTES = 256 * 1024 * 1024   # Memory budget for rendered pages
+RENDER_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+RENDER_RETRIES = 1                       # Resubmits of a request whose worker process died
+PLACEHOLDER_ZOOM = 0.25                  # Low-res preview shown while rendering
+THUMBNAIL_ZOOM = 0.3
+THUMBNAIL_SIZE = QSize(80, 100)
+THUMBNAIL_CACHE_BYTES = 32 * 1024 * 1024
+THUMBNAIL_PREFETCH_ROWS = 10             # Rows rendered beyond the viewport
+DISK_CACHE_BYTES = 512 * 1024 * 1024     # Size cap for CACHE_DIR
+DISK_CACHE_FULL_PAGES = False            # Also keep full-page renders on disk (reading one costs about a render)
+DISK_CACHE_COMPRESSION = 1               # zlib level of cached samples (PNG costs several renders)
+MAX_PAGE_PIXELS = 4096 * 4096            # Cap for the single-pixmap page render
+TILE_SIZE = 512                          # Tile edge in device pixels
+TILE_CACHE_BYTES = 128 * 1024 * 1024
+MAX_TILE_ZOOM = 16                       # Highest tile render scale (1152 DPI)
+MIN_VIEW_ZOOM = 0.25
+MAX_VIEW_ZOOM = MAX_TILE_ZOOM / VIEW_SCALE
+INDEX_CELL_SIZE = 256                    # Grid cell of the scene item index (scene units)
+
+# Export
+OVERLAY_BACKEND = "native"               # "native" (PyMuPDF) or "reportlab"
+EXPORT_CHUNK_PAGES = 64                  # Overlaid pages per incremental save
+EXPORT_MEMORY_LIMIT = 512 * 1024 * 1024  # RSS ceiling for chunked export (bytes)
+
+# Annotations
+AUTOSAVE_DELAY_MS = 1000                 # Idle time before edits are written
+
+# Font detection
+FONT_DETECTION_MODE = "page"             # "page" or "document" (one result for all pages)
+FONT_STATS_CACHE_PAGES = 4096
+FONT_STATS_CHUNK_PAGES = 32              # Pages per document stats task (queued behind renders)
+
+# Profiling
+PROFILE_REPORT = os.environ.get("PDF_EDITOR_PROFILE")  # JSON report path; enables timers
+PROFILE_SAMPLES = 10000                  # Samples kept per timer for percentiles
+
+
+# ==================== Instrumentation ====================
+class Instrumentation:
+    """Opt-in timers and counters for the hot paths.
+
+    Off unless a report path is given (PDF_EDITOR_PROFILE=report.json).
+    When off, timer() returns a no-op context manager and record()/count()
+    return at once, so the calls stay in place. When on, write_report()
+    saves per-timer count, total and percentiles plus counters as JSON.
+
+    Only the calling process is measured: work done in worker processes
+    is recorded by the parent from the durations the workers send back.
+    """
+
+    def __init__(self, report_path=None, max_samples=PROFILE_SAMPLES):
+        self.report_path = report_path
+        self.enabled = bool(report_path)
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}  # timer name -> deque of the latest durations (s)
+        self._totals = {}   # timer name -> [count, total seconds, max seconds]
+        self._counters = Counter()
+
+    def timer(self, name):
+        """Context manager that records how long its block takes."""
+        if not self.enabled:
+            return nullcontext()
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Add a duration measured elsewhere (e.g. by a worker process)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+                self._totals[name] = [0, 0.0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += n
+
+    def timer_stats(self, name):
+        """{'count', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'} or None."""
+        with self._lock:
+            if name not in self._totals:
+                return None
+            samples = sorted(self._samples[name])
+            count, total, longest = self._totals[name]
+
+        def percentile(pct):
+            # Nearest rank over the retained samples
+            index = min(len(samples) - 1, max(0, math.ceil(pct / 100 * len(samples)) - 1))
+            return samples[index] * 1000
+
+        return {
+            'count': count,
+            'total_ms': total * 1000,
+            'mean_ms': total / count * 1000,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'max_ms': longest * 1000,
+        }
+
+    def report(self):
+        """Everything collected so far, as a JSON-serializable dict."""
+        with self._lock:
+            names = sorted(self._totals)
+            counters = dict(sorted(self._counters.items()))
+        return {
+            'created': datetime.now().isoformat(),
+            'pid': os.getpid(),
+            'timers': {name: self.timer_stats(name) for name in names},
+            'counters': counters,
+        }
+
+    def write_report(self, path=None):
+        """Write report() as JSON to path (default: the configured one)."""
+        path = path or self.report_path
+        if not self.enabled or not path:
+            return None
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary(self, names):
+        """Short "name p50 x ms / p95 y ms" text for the status bar."""
+        parts = []
+        for name in names:
+            stats = self.timer_stats(name)
+            if stats:
+                parts.append(f"{name} p50 {stats['p50_ms']:.0f} / p95 {stats['p95_ms']:.0f} ms")
+        return " · ".join(parts)
+
+
+INSTRUMENTATION = Instrumentation(PROFILE_REPORT)
+
+
+# ==================== Document Pool ====================
+class DocumentPool:
+    """Keep PDF documents open between page loads.
+
+    Documents are keyed by absolute path and validated against the file's
+    mtime/size, so a file that changed on disk is transparently reopened.
+    The least recently used document is closed once ``max_documents`` is
+    exceeded. Handles are not thread-safe; use one pool per thread.
+    """
+
+    def __init__(self, max_documents=4):
+        self.max_documents = max_documents
+        self._documents = OrderedDict()  # path -> (key, fitz.Document)
+        self._fingerprints = {}  # document_key -> fingerprint
+
+    @staticmethod
+    def document_key(pdf_path):
+        """Return (absolute path, mtime, size) identifying a PDF on disk."""
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, pdf_path):
+        """Return an open document for the path, opening it if needed."""
+        key = self.document_key(pdf_path)
+        path = key[0]
+
+        entry = self._documents.get(path)
+        if entry is not None:
+            cached_key, doc = entry
+            if cached_key == key and not doc.is_closed:
+                self._documents.move_to_end(path)
+                INSTRUMENTATION.count("document.reuse")
+                return doc
+            # File changed on disk (or handle closed elsewhere) - reopen
+            self._close_entry(path)
+
+        with INSTRUMENTATION.timer("document.open"):
+            doc = fitz.open(path)
+        self._documents[path] = (key, doc)
+
+        # Evict least recently used documents
+        while len(self._documents) > self.max_documents:
+            oldest_path = next(iter(self._documents))
+            self._close_entry(oldest_path)
+
+        return doc
+
+    def page_count(self, pdf_path):
+        """Get number of pages without reparsing the file."""
+        return len(self.get(pdf_path))
+
+    def fingerprint(self, pdf_path):
+        """Content id of a PDF: hash of its trailer /ID and file size.
+
+        Stable across renames and copies, so it can key per-document
+        data. Files without an /ID hash their first and last 64 KB.
+        """
+        key = self.document_key(pdf_path)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            digest = hashlib.sha1(str(key[2]).encode("ascii"))
+            kind, value = self.get(pdf_path).xref_get_key(-1, "ID")
+            if kind == "array":
+                digest.update(value.encode("latin-1"))
+            else:
+                with open(key[0], 'rb') as f:
+                    digest.update(f.read(65536))
+                    f.seek(max(0, key[2] - 65536))
+                    digest.update(f.read(65536))
+            fingerprint = digest.hexdigest()[:24]
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def close(self, pdf_path):
+        """Close the document for a path, if open."""
+        self._close_entry(os.path.abspath(pdf_path))
+
+    def close_all(self):
+        """Close every pooled document."""
+        for path in list(self._documents):
+            self._close_entry(path)
+
+    def _close_entry(self, path):
+        entry = self._documents.pop(path, None)
+        if entry is not None and not entry[1].is_closed:
+            entry[1].close()
+
+
+# Shared pool used by the GUI thread (viewer, thumbnails, font detector)
+DOCUMENT_POOL = DocumentPool()
+
+
+# ==================== Pixmap Conversion ====================
+def qimage_compatible(pix):
+    """Return pix, or an RGB copy if its samples have no QImage format.
+
+    QImage takes gray, RGB and RGBA samples; CMYK and other colorspaces,
+    and gray + alpha, are converted to RGB.
+    """
+    if pix.colorspace is not None and pix.colorspace.n not in (1, 3):
+        return fitz.Pixmap(fitz.csRGB, pix)
+    if pix.n == 2:
+        return fitz.Pixmap(fitz.csRGB, pix)
+    return pix
+
+
+def samples_to_qimage(samples, width, height, stride, n, alpha):
+    """Wrap raw RGB/RGBA/gray samples in a QImage without copying.
+
+    The sample buffer is attached to the QImage wrapper so it stays alive
+    for the image's lifetime.
+    """
+    if n == 1:
+        fmt = QImage.Format_Grayscale8
+    elif alpha:
+        fmt = QImage.Format_RGBA8888
+    else:
+        fmt = QImage.Format_RGB888
+
+    image = QImage(samples, width, height, stride, fmt)
+    image._samples = samples  # Keep sample buffer alive
+    return image
+
+
+# ==================== Page Render Cache ====================
+class PageRenderCache:
+    """LRU cache of rendered pages bounded by a memory budget in bytes.
+
+    Entries are keyed by (document key, page, zoom, rotation) and hold
+    QPixmap/QImage objects directly, so a cache hit needs no conversion.
+    """
+
+    def __init__(self, max_bytes=RENDER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (image, nbytes)
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(doc_key, page_num, zoom, rotation=0, clip=None):
+        """Build a cache key for a rendered page (or a clipped tile)."""
+        key = (doc_key, page_num, float(zoom), rotation % 360)
+        if clip is not None:
+            key += (tuple(clip),)
+        return key
+
+    @staticmethod
+    def image_bytes(image):
+        """Estimate memory used by a QPixmap or QImage."""
+        return image.width() * image.height() * max(image.depth(), 8) // 8
+
+    def get(self, key):
+        """Return cached image or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, image):
+        """Store an image, evicting least recently used entries."""
+        nbytes = self.image_bytes(image)
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key)[1]
+
+        # Never keep a single image larger than the whole budget
+        if nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = (image, nbytes)
+        self._total_bytes += nbytes
+        self._evict()
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._total_bytes -= nbytes
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# ==================== Disk Render Cache ====================
+class DiskRenderCache:
+    """Persistent cache of page renders and thumbnails.
+
+    Entries hold the raw render samples, zlib-compressed at a fast level,
+    and are written on a background thread (store_later) so a render is
+    returned before its entry is encoded. Files are named by a (path,
+    size, mtime) fingerprint plus page number and zoom, so a document
+    that changed on disk never hits stale entries. Writes are atomic
+    (temp file + rename), unreadable files are treated as misses and
+    deleted, and trim() evicts least recently used files once the
+    directory grows past max_bytes. The cache is best effort: I/O errors
+    never propagate to rendering.
+    """
+
+    HEADER = struct.Struct("<IIIB?")  # width, height, stride, n, alpha
+
+    _writer = None  # Per-process writer thread, created on first store_later()
+
+    def __init__(self, cache_dir, max_bytes=DISK_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def fingerprint(doc_key):
+        """Hash a DocumentPool.document_key into a file-name-safe id."""
+        return hashlib.sha1(repr(doc_key).encode("utf-8")).hexdigest()[:24]
+
+    def entry_path(self, doc_key, page_num, zoom):
+        """Path of the cache file for one rendered page."""
+        fingerprint = self.fingerprint(doc_key)
+        return os.path.join(
+            self.cache_dir, fingerprint[:2],
+            f"{fingerprint}-p{page_num}-z{zoom:g}.bin"
+        )
+
+    def load(self, path):
+        """Return cached (samples, width, height, stride, n, alpha), or None
+        on miss/corruption."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            width, height, stride, n, alpha = self.HEADER.unpack_from(data)
+            samples = zlib.decompress(data[self.HEADER.size:])
+            if len(samples) != stride * height:
+                raise ValueError("sample size mismatch")
+        except Exception:
+            # Truncated or corrupt file - drop it and render again
+            self._remove(path)
+            return None
+
+        # Mark as recently used for trim()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return (samples, width, height, stride, n, alpha)
+
+    def store(self, path, result):
+        """Write render_page_samples() output (atomically)."""
+        samples, width, height, stride, n, alpha = result
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(self.HEADER.pack(width, height, stride, n, alpha))
+                f.write(zlib.compress(samples, DISK_CACHE_COMPRESSION))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Failed to write render cache: {e}")
+            self._remove(tmp_path)
+
+    def store_later(self, path, result):
+        """Queue store() on this process's writer thread."""
+        if DiskRenderCache._writer is None:
+            DiskRenderCache._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="render-cache"
+            )
+        DiskRenderCache._writer.submit(self.store, path, result)
+
+    def trim(self):
+        """Evict least recently used files until under max_bytes."""
+        entries = []
+        total = 0
+        try:
+            for sub in os.scandir(self.cache_dir):
+                if not sub.is_dir():
+                    continue
+                for entry in os.scandir(sub.path):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+DISK_RENDER_CACHE = DiskRenderCache(CACHE_DIR)
+
+
+# ==================== Background Rendering ====================
+def render_page_samples(pdf_path, page_num, zoom, clip=None, disk_cache=None):
+    """Render a page and return (samples, width, height, stride, n, alpha).
+
+    Runs inside RenderWorkerPool processes; each worker process keeps its
+    own DOCUMENT_POOL, so documents stay open between requests. With a
+    disk_cache, whole-page renders are read from there, and written there
+    in the background after the render is returned.
+    """
+    cache_path = None
+    if disk_cache is not None and clip is None:
+        cache_path = disk_cache.entry_path(
+            DocumentPool.document_key(pdf_path), page_num, zoom
+        )
+        cached = disk_cache.load(cache_path)
+        if cached is not None:
+            return cached
+
+    page = DOCUMENT_POOL.get(pdf_path)[page_num]
+    mat = fitz.Matrix(zoom, zoom)
+    pix = qimage_compatible(page.get_pixmap(matrix=mat, clip=fitz.Rect(clip) if clip else None))
+    result = (pix.samples, pix.width, pix.height, pix.stride, pix.n, pix.alpha)
+    if cache_path is not None:
+        disk_cache.store_later(cache_path, result)
+    return result
+
+
+class RenderWorkerPool(QObject):
+    """Render pages in worker processes and deliver QImages via signals.
+
+    PyMuPDF holds the GIL while rasterizing, so renders run in separate
+    processes to keep the GUI thread responsive. Requests are tagged with
+    an owner so each consumer can cancel its own stale work. Other
+    MuPDF-heavy work can be queued with submit_task().
+
+    If a worker process dies, the executor is replaced and the affected
+    requests are resubmitted (RENDER_RETRIES times) before render_failed.
+    """
+
+    page_rendered = pyqtSignal(object, object, object)  # owner, key, QImage
+    render_failed = pyqtSignal(object, object, str)     # owner, key, error
+    task_finished = pyqtSignal(object, object, object)  # owner, key, result
+
+    # Internal: future callbacks run on an executor thread
+    _future_done = pyqtSignal(object, object, object, bool)
+
+    _shared = None
+
+    def __init__(self, max_workers=RENDER_WORKERS, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = {}  # (owner id, key) -> (owner, future)
+        self._future_done.connect(self._on_future_done)
+
+    @classmethod
+    def shared(cls):
+        """Return the pool shared by the viewer and thumbnails."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(self, owner, key, pdf_path, page_num, zoom, clip=None, disk_cache=None):
+        """Queue a render unless the same request is already pending."""
+        self._submit(
+            owner, key, True, render_page_samples,
+            (pdf_path, page_num, zoom, tuple(clip) if clip else None, disk_cache)
+        )
+
+    def submit_task(self, owner, key, func, *args):
+        """Run a picklable module-level function in a worker process.
+
+        The return value is delivered through task_finished.
+        """
+        self._submit(owner, key, False, func, args)
+
+    def _submit(self, owner, key, is_render, func, args, attempt=0):
+        slot = (id(owner), key)
+        if slot in self._futures:
+            return
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died since the last request: start a fresh pool
+            self._discard_executor()
+            future = self._get_executor().submit(func, *args)
+        future.submitted = time.perf_counter()
+        future.request = (func, args, attempt)
+        self._futures[slot] = (owner, future)
+        future.add_done_callback(
+            lambda f, owner=owner, key=key: self._emit_done(owner, key, f, is_render)
+        )
+
+    def is_pending(self, owner, key):
+        """Check whether a request is queued or running."""
+        return (id(owner), key) in self._futures
+
+    def cancel_except(self, owner, keep=()):
+        """Cancel an owner's queued requests whose key is not in keep."""
+        keep = set(keep)
+        for slot, (slot_owner, future) in list(self._futures.items()):
+            if slot_owner is owner and slot[1] not in keep:
+                if future.cancel():
+                    # cancel() runs the done callback, which may drop the slot
+                    self._futures.pop(slot, None)
+
+    def shutdown(self):
+        """Stop worker processes, dropping queued requests.
+
+        Waits only for renders already running (at most one per worker).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+
+    def _discard_executor(self):
+        """Drop a broken executor; its queued futures fail and are resubmitted."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _emit_done(self, owner, key, future, is_render):
+        try:
+            self._future_done.emit(owner, key, future, is_render)
+        except RuntimeError:
+            pass  # Pool already deleted during shutdown
+
+    def _on_future_done(self, owner, key, future, is_render):
+        slot = (id(owner), key)
+        if slot in self._futures and self._futures[slot][1] is future:
+            del self._futures[slot]
+        if future.cancelled():
+            return
+
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            func, args, attempt = future.request
+            if attempt < RENDER_RETRIES:
+                self._submit(owner, key, is_render, func, args, attempt + 1)
+            else:
+                self.render_failed.emit(owner, key, str(e) or "render worker stopped")
+            return
+        except Exception as e:
+            self.render_failed.emit(owner, key, str(e))
+            return
+
+        # Queue wait plus work in the worker process
+        INSTRUMENTATION.record("render.worker" if is_render else "task.worker",
+                               time.perf_counter() - future.submitted)
+        if is_render:
+            with INSTRUMENTATION.timer("render.qimage"):
+                image = samples_to_qimage(*result)
+            self.page_rendered.emit(owner, key, image)
+        else:
+            self.task_finished.emit(owner, key, result)
 
 
 # ==================== Font Detection Utilities ====================
 class FontDetector:
-    """Detect font properties from PDF text."""
+    """Detect font properties from PDF text.
+
+    Span statistics are memoized per (document, page), so revisiting a
+    page costs nothing. In "document" mode document_font_stats() collects
+    them a chunk of pages at a time on a worker process and seed() loads
+    each chunk; the last one provides document-wide properties.
+    """
+
+    # Span-only extraction: skip image blocks, which copy image data
+    TEXT_FLAGS = getattr(
+        fitz, "TEXTFLAGS_DICT",
+        fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_IMAGES
+    ) & ~fitz.TEXT_PRESERVE_IMAGES
+
+    # Map PDF font names to common fonts
+    FONT_MAPPING = {
+        'Helvetica': 'Helvetica',
+        'Times-Roman': 'Times New Roman',
+        'Arial': 'Arial',
+        'Courier': 'Courier New',
+        'SimSun': 'SimSun',  # Chinese font
+        'SimHei': 'SimHei',  # Chinese bold font
+    }
+
+    # (doc_key, page_num or None for whole document) -> span stats
+    _stats_cache = OrderedDict()
+    # doc_key -> stats summed over the chunks seeded so far
+    _partial_stats = {}
 
-    @staticmethod
-    def detect_font_properties(pdf_path, page_num=0):
+    @classmethod
+    def detect_font_properties(cls, pdf_path, page_num=0):
         """Detect common font properties from PDF page."""
-        doc = fitz.open(pdf_path)
-        page = doc[page_num]
+        with INSTRUMENTATION.timer("font.detect"):
+            key = (DOCUMENT_POOL.document_key(pdf_path), page_num)
+            stats = cls._cached(key)
+            if stats is None:
+                page = DOCUMENT_POOL.get(pdf_path)[page_num]
+                stats = cls.page_font_stats(page)
+                cls._remember(key, stats)
+            return cls.properties_from_stats(stats)
+
+    @classmethod
+    def document_font_properties(cls, doc_key):
+        """Properties over all pages, or None until seed() has run."""
+        stats = cls._cached((doc_key, None))
+        if stats is None:
+            return None
+        return cls.properties_from_stats(stats)
+
+    @classmethod
+    def page_font_stats(cls, page):
+        """Return (size sum, span count, {font name: count}) for a page."""
+        size_sum = 0.0
+        size_count = 0
+        font_counts = {}
+
+        blocks = page.get_text("dict", flags=cls.TEXT_FLAGS)
+        for block in blocks.get("blocks", []):
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    if "size" in span:
+                        size_sum += span["size"]
+                        size_count += 1
+                    if "font" in span:
+                        font_counts[span["font"]] = font_counts.get(span["font"], 0) + 1
+
+        return (size_sum, size_count, font_counts)
+
+    @classmethod
+    def document_font_stats(cls, pdf_path, first=0, count=None):
+        """Collect per-page stats for count pages from first (default: all).
+
+        Returns (doc_key, first, [stats per page]) for seed().
+        """
+        doc_key = DocumentPool.document_key(pdf_path)
+        doc = DOCUMENT_POOL.get(pdf_path)
+        last = len(doc) if count is None else min(len(doc), first + count)
+        return doc_key, first, [cls.page_font_stats(doc[n]) for n in range(first, last)]
+
+    @classmethod
+    def seed(cls, doc_key, first, page_stats, complete=True):
+        """Store a document_font_stats() chunk; complete marks the last one."""
+        partial = cls._partial_stats.pop(doc_key, None) if first else None
+        size_sum, size_count, font_counts = partial or (0.0, 0, {})
+        for offset, stats in enumerate(page_stats):
+            cls._remember((doc_key, first + offset), stats)
+            size_sum += stats[0]
+            size_count += stats[1]
+            for name, count in stats[2].items():
+                font_counts[name] = font_counts.get(name, 0) + count
+        if complete:
+            cls._remember((doc_key, None), (size_sum, size_count, font_counts))
+        else:
+            cls._partial_stats[doc_key] = (size_sum, size_count, font_counts)
 
-        # Get text blocks with font info
-        blocks = page.get_text("dict")
+    @classmethod
+    def properties_from_stats(cls, stats):
+        """Turn span stats into font properties."""
+        size_sum, size_count, font_counts = stats
         font_properties = {
             'family': 'Helvetica',  # Default fallback
             'size': 12,             # Default fallback
             'color': (0, 0, 0)      # Default black
         }
 
-        # Analyze fonts used in the document
-        font_sizes = []
-        font_names = []
-
-        for block in blocks.get("blocks", []):
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line.get("spans", []):
-                        # Get font size
-                        if "size" in span:
-                            font_sizes.append(span["size"])
-
-                        # Get font name
-                        if "font" in span:
-                            font_names.append(span["font"])
-
-        doc.close()
-
-        # Use most common font size
-        if font_sizes:
-            # Use median or most frequent
-            font_properties['size'] = int(round(sum(font_sizes) / len(font_sizes)))
-
-        # Map PDF font names to common fonts
-        font_mapping = {
-            'Helvetica': 'Helvetica',
-            'Times-Roman': 'Times New Roman',
-            'Arial': 'Arial',
-            'Courier': 'Courier New',
-            'SimSun': 'SimSun',  # Chinese font
-            'SimHei': 'SimHei',  # Chinese bold font
-        }
+        # Use average span size
+        if size_count:
+            font_properties['size'] = int(round(size_sum / size_count))
 
-        if font_names:
+        if font_counts:
             # Find most common font family
-            from collections import Counter
-            font_counts = Counter(font_names)
-            most_common = font_counts.most_common(1)[0][0]
+            most_common = Counter(font_counts).most_common(1)[0][0]
 
             # Try to match
-            for pdf_font, qt_font in font_mapping.items():
+            for pdf_font, qt_font in cls.FONT_MAPPING.items():
                 if pdf_font.lower() in most_common.lower():
                     font_properties['family'] = qt_font
                     break
 
         return font_properties
 
+    @classmethod
+    def _cached(cls, key):
+        stats = cls._stats_cache.get(key)
+        if stats is not None:
+            cls._stats_cache.move_to_end(key)
+        return stats
+
+    @classmethod
+    def _remember(cls, key, stats):
+        cls._stats_cache[key] = stats
+        cls._stats_cache.move_to_end(key)
+        while len(cls._stats_cache) > FONT_STATS_CACHE_PAGES:
+            cls._stats_cache.popitem(last=False)
+
+
+# ==================== Scene Item Index ====================
+class SceneItemIndex:
+    """Typed registry of annotation items with a grid over their rectangles.
+
+    Items are registered by kind ('text_box', 'signature') and bucketed
+    into square cells of the page by their scene bounding rectangles, so
+    counts are O(1) and hit tests and overlap queries only look at the
+    few items in the cells touched, not at every item in the scene.
+    Registered items report moves, resizes and removal via item_changed().
+    """
+
+    def __init__(self, cell_size=INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self._kinds = {}   # kind -> {item: None} (insertion ordered)
+        self._cells = {}   # (column, row) -> {item, ...}
+        self._entries = {}  # item -> (kind, cells)
+
+    def add(self, item, kind):
+        """Register an item (already in the scene) under a kind."""
+        if item in self._entries:
+            self.remove(item)
+        cells = self._cells_for(item.sceneBoundingRect())
+        self._entries[item] = (kind, cells)
+        self._kinds.setdefault(kind, {})[item] = None
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item)
+        item.scene_index = self
+
+    def remove(self, item):
+        """Unregister an item."""
+        entry = self._entries.pop(item, None)
+        if entry is None:
+            return
+        kind, cells = entry
+        self._kinds[kind].pop(item, None)
+        self._drop_from_cells(item, cells)
+        item.scene_index = None
+
+    def update(self, item):
+        """Re-bucket an item after it moved or changed size."""
+        entry = self._entries.get(item)
+        if entry is None:
+            return
+        kind, old_cells = entry
+        cells = self._cells_for(item.sceneBoundingRect())
+        if cells == old_cells:
+            return
+        self._drop_from_cells(item, old_cells)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item)
+        self._entries[item] = (kind, cells)
+
+    def item_changed(self, item, change, value):
+        """Keep the index current; call from the item's itemChange()."""
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.update(item)
+        elif change == QGraphicsItem.ItemSceneHasChanged and value is None:
+            self.remove(item)
+
+    def clear(self):
+        """Forget all items (e.g. after scene.clear())."""
+        self._kinds = {}
+        self._cells = {}
+        self._entries = {}
+
+    def items(self, kind):
+        """Registered items of a kind, oldest first."""
+        return list(self._kinds.get(kind, ()))
+
+    def count(self, kind):
+        return len(self._kinds.get(kind, ()))
+
+    def items_at(self, point, kind=None):
+        """Items whose bounding rectangle contains a scene point, topmost first."""
+        cell = (int(point.x() // self.cell_size), int(point.y() // self.cell_size))
+        found = [
+            item for item in self._cells.get(cell, ())
+            if (kind is None or self._entries[item][0] == kind)
+            and item.sceneBoundingRect().contains(point)
+        ]
+        found.sort(key=lambda item: item.zValue(), reverse=True)
+        return found
+
+    def items_in(self, rect, kind=None):
+        """Items whose bounding rectangle intersects a scene rectangle."""
+        found = set()
+        for cell in self._cells_for(rect):
+            for item in self._cells.get(cell, ()):
+                if (kind is None or self._entries[item][0] == kind) \
+                        and item.sceneBoundingRect().intersects(rect):
+                    found.add(item)
+        return list(found)
+
+    def overlapping(self, item, kind=None):
+        """Other items overlapping an item (which need not be registered)."""
+        return [other for other in self.items_in(item.sceneBoundingRect(), kind)
+                if other is not item]
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        left = int(rect.left() // size)
+        right = int(rect.right() // size)
+        top = int(rect.top() // size)
+        bottom = int(rect.bottom() // size)
+        return tuple(
+            (column, row)
+            for column in range(left, right + 1)
+            for row in range(top, bottom + 1)
+        )
+
+    def _drop_from_cells(self, item, cells):
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+
 
 # ==================== Custom Text Widget ====================
 class PDFTextWidget(QWidget):
@@ -185,62 +1029,205 @@ class PDFTextWidget(QWidget):
 
 
 # ==================== Custom Text Item ====================
-class PDFTextBoxItem(QGraphicsProxyWidget):
-    """Text box item using QWidget for proper Chinese input support."""
+class PDFTextBoxItem(QGraphicsObject):
+    """Text box item that paints its own text.
+
+    The text is laid out once into cached QStaticText lines and painted
+    directly, so a page can hold thousands of boxes. A PDFTextWidget
+    editor (with Chinese input method support) is only created while the
+    box is being edited: double-click or "Edit" in the context menu.
+
+    The box is laid out in screen pixels at 100% zoom (item scale
+    1 / VIEW_SCALE); its position and the saved geometry are PDF points.
+    edited is emitted after the user changes the text, moves the box,
+    changes its font or deletes it.
+    """
+
+    edited = pyqtSignal()
+
+    TEXT_MARGIN = 4                      # Matches QTextEdit's document margin
+    LEGACY_KEYS = ('scene_x', 'scene_y', 'display_scale_x', 'display_scale_y')
+    MIN_SIZE = (100, 30)
+    MAX_SIZE = (400, 300)
 
     def __init__(self, text="", font_family="Helvetica", font_size=12, parent=None):
         super().__init__(parent)
-
-        # Create the text widget
-        self._text_widget = PDFTextWidget(text, font_family, font_size)
-        self.setWidget(self._text_widget)
+        self.scene_index = None   # SceneItemIndex the item is registered in
+        self._text = text
+        self._font_family = font_family
+        self._font_size = font_size
+        self._font = QFont(font_family, font_size)
+        self._width = 200
+        self._height = 60
+        self._lines = None    # [(QPointF, QStaticText)], built on first paint
+        self._editor = None   # QGraphicsProxyWidget while editing
+        self._text_before_edit = text
+        self._press_pos = None
 
         # Item flags
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setZValue(500)
+        self.setScale(1 / VIEW_SCALE)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self._width, self._height)
+
+    def paint(self, painter, option, widget=None):
+        if self._editor is None:
+            if self._lines is None:
+                self._lines = self._layout_lines()
+            painter.save()
+            painter.setClipRect(self.boundingRect())
+            painter.setFont(self._font)
+            painter.setPen(Qt.black)
+            for point, line in self._lines:
+                painter.drawStaticText(point, line)
+            painter.restore()
+
+        if self.isSelected() and self._editor is None:
+            painter.setPen(QPen(QColor("#4A90E2"), 1, Qt.DashLine))
+            painter.drawRect(self.boundingRect().adjusted(0.5, 0.5, -0.5, -0.5))
+
+    def _layout_lines(self):
+        """Lay out the text as one wrapped QStaticText per paragraph."""
+        width = max(1.0, self._width - 2 * self.TEXT_MARGIN)
+        line_spacing = QFontMetricsF(self._font).lineSpacing()
+        lines = []
+        y = self.TEXT_MARGIN
+        for paragraph in self._text.split("\n"):
+            if paragraph:
+                line = QStaticText(paragraph)
+                line.setTextFormat(Qt.PlainText)
+                line.setTextWidth(width)
+                line.setPerformanceHint(QStaticText.AggressiveCaching)
+                line.prepare(QTransform(), self._font)
+                lines.append((QPointF(self.TEXT_MARGIN, y), line))
+                y += line.size().height()
+            else:
+                y += line_spacing
+        return lines
+
+    def _invalidate(self):
+        self._lines = None
+        self.update()
 
-        # Initial size
-        self._text_widget.resize(200, 60)
-        self.resize(200, 60)
+    def resize(self, width, height):
+        """Set the box size."""
+        if (width, height) == (self._width, self._height):
+            return
+        self.prepareGeometryChange()
+        self._width = width
+        self._height = height
+        if self._editor is not None:
+            self._editor.widget().resize(int(width), int(height))
+        if self.scene_index is not None:
+            self.scene_index.update(self)
+        self._invalidate()
 
-        # Auto-resize when text changes
-        self._text_widget.text_edit.textChanged.connect(self._auto_resize)
+    def itemChange(self, change, value):
+        if self.scene_index is not None:
+            self.scene_index.item_changed(self, change, value)
+        return super().itemChange(change, value)
 
     def _auto_resize(self):
-        """Auto resize widget based on content."""
-        # Get document size
-        doc = self._text_widget.text_edit.document()
-        doc.setTextWidth(self._text_widget.text_edit.width())
-        size = doc.size().toSize()
+        """Resize the box to fit its text, within MIN_SIZE/MAX_SIZE."""
+        metrics = QFontMetricsF(self._font)
+        paragraphs = self._text.split("\n")
+        text_width = max(metrics.horizontalAdvance(p) for p in paragraphs)
+
+        new_width = min(max(self.MIN_SIZE[0], text_width + 2 * self.TEXT_MARGIN + 20),
+                        self.MAX_SIZE[0])
+        wrapped = metrics.boundingRect(
+            QRectF(0, 0, new_width - 2 * self.TEXT_MARGIN, 1e6),
+            Qt.TextWordWrap, self._text
+        )
+        new_height = min(max(self.MIN_SIZE[1], wrapped.height() + 2 * self.TEXT_MARGIN + 10),
+                         self.MAX_SIZE[1])
+        self.resize(int(new_width), int(new_height))
+
+    # ---- Editing ----
+    def start_editing(self, select_all=False):
+        """Show an editor widget over the box and focus it."""
+        if self._editor is None:
+            editor_widget = PDFTextWidget(self._text, self._font_family, self._font_size)
+            editor_widget.resize(int(self._width), int(self._height))
+            editor_widget.text_edit.textChanged.connect(self._on_editor_text_changed)
+            editor_widget.text_edit.installEventFilter(self)
+
+            self._editor = QGraphicsProxyWidget(self)
+            self._editor.setWidget(editor_widget)
+            self._text_before_edit = self._text
+            self.update()
+
+        text_edit = self._editor.widget().text_edit
+        self._editor.setFocus()
+        text_edit.setFocus()
+        if select_all:
+            text_edit.selectAll()
+
+    def finish_editing(self):
+        """Drop the editor and go back to painting the text."""
+        if self._editor is None:
+            return
+        editor, self._editor = self._editor, None
+        editor.widget().text_edit.removeEventFilter(self)
+        editor.setParentItem(None)
+        if editor.scene():
+            editor.scene().removeItem(editor)
+        editor.deleteLater()
+        self._invalidate()
+        if self._text != self._text_before_edit:
+            self.edited.emit()
+
+    def _on_editor_text_changed(self):
+        self._text = self._editor.widget().get_text()
+        self._auto_resize()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.FocusOut and event.reason() != Qt.PopupFocusReason:
+            # Let the focus change finish before the editor is deleted
+            QTimer.singleShot(0, self.finish_editing)
+        elif event.type() == QEvent.KeyPress and event.key() == Qt.Key_Escape:
+            self.clearFocus()
+            QTimer.singleShot(0, self.finish_editing)
+            return True
+        return False
 
-        # Add some padding
-        new_width = max(100, size.width() + 20)
-        new_height = max(30, size.height() + 10)
+    def mousePressEvent(self, event):
+        self._press_pos = self.pos()
+        super().mousePressEvent(event)
 
-        # Limit maximum size
-        new_width = min(new_width, 400)
-        new_height = min(new_height, 300)
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self._press_pos is not None and self.pos() != self._press_pos:
+            self.edited.emit()
+        self._press_pos = None
 
-        self._text_widget.resize(new_width, new_height)
-        self.resize(new_width, new_height)
+    def mouseDoubleClickEvent(self, event):
+        self.start_editing()
 
+    # ---- Properties ----
     def set_font_properties(self, family, size):
         """Set font properties."""
-        self._text_widget.set_font_properties(family, size)
+        self._font_family = family
+        self._font_size = size
+        self._font = QFont(family, size)
+        if self._editor is not None:
+            self._editor.widget().set_font_properties(family, size)
+        self._invalidate()
 
     def get_font_properties(self):
         """Get font properties."""
-        return self._text_widget.get_font_properties()
+        return {
+            'family': self._font_family,
+            'size': self._font_size
+        }
 
     def toPlainText(self):
         """Get plain text content."""
-        return self._text_widget.get_text()
-
-    def pos(self):
-        """Get position."""
-        return super().pos()
+        return self._text
 
     def contextMenuEvent(self, event):
         """Show context menu."""
@@ -254,119 +1241,101 @@ class PDFTextBoxItem(QGraphicsProxyWidget):
         action = menu.exec_(event.screenPos())
 
         if action == edit_action:
-            self._text_widget.text_edit.setFocus()
-            self._text_widget.text_edit.selectAll()
+            self.start_editing(select_all=True)
         elif action == delete_action:
             # Remove from scene
+            self.finish_editing()
             if self.scene():
                 self.scene().removeItem(self)
+                self.edited.emit()
         elif action == font_action:
             # Change font
             font, ok = QFontDialog.getFont(
-                QFont(self._text_widget._font_family, self._text_widget._font_size),
+                QFont(self._font_family, self._font_size),
                 None,
                 "Select Font"
             )
             if ok:
                 self.set_font_properties(font.family(), font.pointSize())
+                self.edited.emit()
 
-    def to_dict(self, pdf_width=None, pdf_height=None, display_width=None, display_height=None):
-        """Serialize to dictionary.
-
-        Args:
-            pdf_width: PDF page width (for coordinate conversion)
-            pdf_height: PDF page height (for coordinate conversion)
-            display_width: Display width (for coordinate conversion)
-            display_height: Display height (for coordinate conversion)
-
-        If display dimensions are provided, coordinates will be converted to PDF coordinates.
-        Otherwise, scene coordinates are saved directly.
-        """
-        scene_x = self.pos().x()
-        scene_y = self.pos().y()
-
-        # Convert to PDF coordinates if dimensions provided
-        if pdf_width and display_width:
-            x = scene_x * (pdf_width / display_width)
-            display_scale_x = pdf_width / display_width
-        else:
-            x = scene_x
-            display_scale_x = 1.0
-
-        if pdf_height and display_height:
-            y = scene_y * (pdf_height / display_height)
-            display_scale_y = pdf_height / display_height
-        else:
-            y = scene_y
-            display_scale_y = 1.0
-
+    def to_dict(self):
+        """Serialize to dictionary; position and size are PDF points."""
         return {
             'text': self.toPlainText(),
-            'x': x,
-            'y': y,
-            'scene_x': scene_x,
-            'scene_y': scene_y,
-            'width': self.boundingRect().width(),
-            'height': self.boundingRect().height(),
-            'font_family': self._text_widget._font_family,
-            'font_size': self._text_widget._font_size,
-            'display_scale_x': display_scale_x,
-            'display_scale_y': display_scale_y
+            'x': self.pos().x(),
+            'y': self.pos().y(),
+            'width': self._width * self.scale(),
+            'height': self._height * self.scale(),
+            'font_family': self._font_family,
+            'font_size': self._font_size
         }
 
     @classmethod
-    def from_dict(cls, data, display_width=None, display_height=None, pdf_width=None, pdf_height=None):
-        """Create from dictionary.
-
-        Args:
-            data: Dictionary with text box data
-            display_width: Current display width (for coordinate conversion)
-            display_height: Current display height (for coordinate conversion)
-            pdf_width: PDF page width (for coordinate conversion)
-            pdf_height: PDF page height (for coordinate conversion)
-        """
+    def from_dict(cls, data):
+        """Create from dictionary (see to_dict and page_geometry)."""
         item = cls(
             text=data.get('text', ''),
             font_family=data.get('font_family', 'Helvetica'),
             font_size=data.get('font_size', 12)
         )
 
-        # Calculate position
-        if 'scene_x' in data and 'scene_y' in data:
-            # Use saved scene coordinates directly
-            x = data.get('scene_x', 0)
-            y = data.get('scene_y', 0)
-        elif display_width and pdf_width and display_height and pdf_height:
-            # Convert PDF coordinates to scene coordinates
-            scale_x = data.get('display_scale_x', 1.0)
-            scale_y = data.get('display_scale_y', 1.0)
-            x = data.get('x', 0) / scale_x * (display_width / pdf_width)
-            y = data.get('y', 0) / scale_y * (display_height / pdf_height)
-        else:
-            # Use saved coordinates directly (fallback)
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-
+        x, y, width, height = cls.page_geometry(data)
         item.setPos(x, y)
+        item.resize(int(round(width * VIEW_SCALE)), int(round(height * VIEW_SCALE)))
+        return item
 
-        # Set size
-        width = data.get('width', 200)
-        height = data.get('height', 60)
-        item._text_widget.resize(width, height)
-        item.resize(width, height)
+    @staticmethod
+    def page_geometry(data):
+        """Return (x, y, width, height) of a text box dict in PDF points.
 
-        return item
+        Older saves also carry scene_x/scene_y and display_scale_x/y; their
+        width and height are scene pixels of the LEGACY_SCENE_ZOOM render,
+        and so are x/y when they were saved without page dimensions.
+        """
+        x = data.get('x', 0)
+        y = data.get('y', 0)
+        width = data.get('width', 100)
+        height = data.get('height', 30)
+        if 'scene_x' in data or 'display_scale_x' in data:
+            scale_x = data.get('display_scale_x', 1.0)
+            scale_y = data.get('display_scale_y', 1.0)
+            if scale_x == 1.0 and scale_y == 1.0:
+                scale_x = scale_y = 1 / LEGACY_SCENE_ZOOM
+                x = data.get('scene_x', x) * scale_x
+                y = data.get('scene_y', y) * scale_y
+            width *= scale_x
+            height *= scale_y
+        return x, y, width, height
+
+    @classmethod
+    def normalized_dict(cls, data):
+        """Return a text box dict in the to_dict() layout (PDF points)."""
+        if 'scene_x' not in data and 'display_scale_x' not in data:
+            return data
+        x, y, width, height = cls.page_geometry(data)
+        data = {key: value for key, value in data.items() if key not in cls.LEGACY_KEYS}
+        data.update(x=x, y=y, width=width, height=height)
+        return data
 
 
 # ==================== Signature Item ====================
 class SignatureItem(QGraphicsPixmapItem):
-    """Draggable signature item."""
+    """Draggable signature item.
+
+    The pixmap is scaled for the screen at 100% zoom (item scale
+    1 / VIEW_SCALE), so sceneBoundingRect() is its place on the page in
+    PDF points.
+    """
 
     def __init__(self, pixmap, parent=None):
         super().__init__(pixmap, parent)
+        self.scene_index = None   # SceneItemIndex the item is registered in
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setZValue(1000)
+        self.setTransformationMode(Qt.SmoothTransformation)
+        self.setScale(1 / VIEW_SCALE)
         self._pdf_bounds = QRectF(0, 0, 1000, 1000)
 
     def set_pdf_bounds(self, bounds):
@@ -377,29 +1346,155 @@ class SignatureItem(QGraphicsPixmapItem):
         """Handle item position changes."""
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
-            rect = self.boundingRect()
+            width = self.boundingRect().width() * self.scale()
+            height = self.boundingRect().height() * self.scale()
 
             # Keep within bounds
             if new_pos.x() < 0:
                 new_pos.setX(0)
             if new_pos.y() < 0:
                 new_pos.setY(0)
-            if new_pos.x() + rect.width() > self._pdf_bounds.width():
-                new_pos.setX(self._pdf_bounds.width() - rect.width())
-            if new_pos.y() + rect.height() > self._pdf_bounds.height():
-                new_pos.setY(self._pdf_bounds.height() - rect.height())
+            if new_pos.x() + width > self._pdf_bounds.width():
+                new_pos.setX(self._pdf_bounds.width() - width)
+            if new_pos.y() + height > self._pdf_bounds.height():
+                new_pos.setY(self._pdf_bounds.height() - height)
 
             return new_pos
 
+        if self.scene_index is not None:
+            self.scene_index.item_changed(self, change, value)
         return super().itemChange(change, value)
 
 
+# ==================== Tiled Rendering ====================
+class TileLayer(QObject):
+    """Sharp page tiles drawn over the page render when zoomed in.
+
+    Once the view shows the page at more pixels per point than the page
+    render has, only the visible TILE_SIZE tiles are rasterized (with
+    get_pixmap(clip=...)) at the next power-of-two zoom level. Tiles are
+    cached per zoom level; off-screen tiles are removed from the scene and
+    their pending renders cancelled.
+    """
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.cache = PageRenderCache(TILE_CACHE_BYTES)
+        self.render_pool = RenderWorkerPool.shared()
+        self.render_pool.page_rendered.connect(self._on_tile_rendered)
+        self.render_pool.render_failed.connect(self._on_tile_failed)
+        self._items = {}  # key -> QGraphicsPixmapItem in the scene
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(30)
+        self._update_timer.timeout.connect(self.update_tiles)
+
+    def reset(self):
+        """Forget tile items (call before the scene is cleared)."""
+        self._items.clear()
+        self.render_pool.cancel_except(self)
+
+    def schedule_update(self):
+        """Update tiles once scrolling/zooming settles."""
+        self._update_timer.start()
+
+    def tile_zoom(self):
+        """Render scale for tiles, or None if the page render is enough."""
+        view = self.view
+        on_screen = view.transform().m11() * view.devicePixelRatioF()
+        if on_screen <= view.base_zoom * 1.05:
+            return None
+        return min(MAX_TILE_ZOOM, 2 ** math.ceil(math.log2(on_screen)))
+
+    def update_tiles(self):
+        """Show/render tiles covering the visible part of the page."""
+        view = self.view
+        if view.pdf_path is None:
+            return
+
+        wanted = {}
+        zoom = self.tile_zoom()
+        if zoom is not None:
+            visible = view.mapToScene(view.viewport().rect()).boundingRect()
+            visible = visible.intersected(view.scene.sceneRect())
+
+            # Scene units are PDF points, tiles are TILE_SIZE pixels at zoom
+            span = TILE_SIZE / zoom
+            left, top = visible.left(), visible.top()
+            right, bottom = visible.right(), visible.bottom()
+
+            for ty in range(int(top // span), int(math.ceil(bottom / span))):
+                for tx in range(int(left // span), int(math.ceil(right / span))):
+                    clip = (
+                        tx * span, ty * span,
+                        min((tx + 1) * span, view.pdf_width),
+                        min((ty + 1) * span, view.pdf_height)
+                    )
+                    key = PageRenderCache.make_key(
+                        view.doc_key, view.current_page, zoom, view.page_rotation, clip
+                    )
+                    wanted[key] = clip
+
+        # Drop off-screen tiles and tiles of other zoom levels
+        for key in [k for k in self._items if k not in wanted]:
+            view.scene.removeItem(self._items.pop(key))
+        self.render_pool.cancel_except(self, wanted)
+
+        for key, clip in wanted.items():
+            if key in self._items:
+                continue
+            pixmap = self.cache.get(key)
+            if pixmap is not None:
+                self._show_tile(key, pixmap)
+            else:
+                self.render_pool.submit(
+                    self, key, view.pdf_path, view.current_page, zoom, clip=clip
+                )
+
+    def _show_tile(self, key, pixmap):
+        view = self.view
+        zoom, clip = key[2], key[4]
+        item = QGraphicsPixmapItem(pixmap)
+        item.setPos(clip[0], clip[1])
+        item.setScale(1 / zoom)
+        item.setZValue(1)
+        view.scene.addItem(item)
+        self._items[key] = item
+
+    def _on_tile_rendered(self, owner, key, image):
+        if owner is not self:
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self.cache.put(key, pixmap)
+
+        # Still wanted: same page and tile not yet shown
+        if (key[0] == self.view.doc_key and key[1] == self.view.current_page
+                and key not in self._items and self.tile_zoom() == key[2]):
+            self._show_tile(key, pixmap)
+
+    def _on_tile_failed(self, owner, key, error):
+        # The page render stays visible; the tile is requested again on the next update
+        if owner is self:
+            print(f"Error rendering tile of page {key[1] + 1}: {error}")
+
+
 # ==================== PDF Graphics View ====================
 class PDFGraphicsView(QGraphicsView):
-    """Graphics view for displaying PDF with signature and text overlay."""
+    """Graphics view for displaying PDF with signature and text overlay.
+
+    Scene units are PDF points from the page's top-left corner, and the
+    view transform (VIEW_SCALE * zoom) maps them to the screen. The page
+    render is scaled to cover the page, so its resolution (RENDER_ZOOM,
+    tiles when zoomed in) never affects item positions or saved data.
+    """
 
     page_changed = pyqtSignal(int)
     text_boxes_changed = pyqtSignal()
+    text_boxes_edited = pyqtSignal()   # user changed a box on this page
+    render_failed = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -412,6 +1507,7 @@ class PDFGraphicsView(QGraphicsView):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setBackgroundBrush(QColor(240, 240, 240))
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 
         # State
         self.current_page = 0
@@ -420,67 +1516,230 @@ class PDFGraphicsView(QGraphicsView):
         self.pdf_height = 0
         self.pdf_pixmap_item = None
         self.signature_item = None
-        self.text_boxes = []
+        self.item_index = SceneItemIndex()
         self.scroll_speed = 30
 
+        # Rendering
+        self.pdf_path = None
+        self.doc_key = None
+        self.page_rotation = 0
+        self.render_zoom = RENDER_ZOOM
+        self.base_zoom = RENDER_ZOOM
+        self.view_zoom = 1.0
+        self.render_cache = PageRenderCache()
+        self._switch_started = None  # perf_counter() of a page load awaiting its render
+        self._font_stats_key = None  # ("fonts", doc_key, first page) of the queued stats chunk
+        self.render_pool = RenderWorkerPool.shared()
+        self.render_pool.page_rendered.connect(self._on_page_rendered)
+        self.render_pool.task_finished.connect(self._on_task_finished)
+        self.render_pool.render_failed.connect(self._on_render_failed)
+        self._page_key = None
+        self._preview_key = None
+
+        # Tiles for zoom levels beyond the page render
+        self.tile_layer = TileLayer(self)
+        self.horizontalScrollBar().valueChanged.connect(self.tile_layer.schedule_update)
+        self.verticalScrollBar().valueChanged.connect(self.tile_layer.schedule_update)
+        self.set_zoom(1.0)
+
         # Text box mode
         self.text_box_mode = False
         self.detected_font = None
 
     def load_pdf_page(self, pdf_path, page_num):
-        """Load a specific page from the PDF."""
-        doc = fitz.open(pdf_path)
+        """Load a specific page from the PDF.
+
+        Cached renders are shown immediately. Otherwise a low-res
+        placeholder is shown and the full render is delivered by the
+        render worker pool, which also prefetches the adjacent pages.
+        """
+        start = time.perf_counter()
+        doc = DOCUMENT_POOL.get(pdf_path)
         page = doc[page_num]
 
+        self.pdf_path = pdf_path
         self.current_page = page_num
         self.total_pages = len(doc)
 
-        # Get page dimensions
+        # Get page dimensions (the scene size, in points)
         rect = page.rect
         self.pdf_width = rect.width
         self.pdf_height = rect.height
 
-        # Render page to image
-        mat = fitz.Matrix(2, 2)
-        pix = page.get_pixmap(matrix=mat)
-        img_data = pix.tobytes("png")
+        # Large-format pages get a smaller page render; tiles add detail
+        self.base_zoom = self._base_zoom(rect)
 
-        # Create QPixmap
-        pixmap = QPixmap()
-        pixmap.loadFromData(img_data)
+        doc_key = DOCUMENT_POOL.document_key(pdf_path)
+        self.doc_key = doc_key
+        self.page_rotation = page.rotation
+        self._page_key = PageRenderCache.make_key(
+            doc_key, page_num, self.base_zoom, page.rotation
+        )
+        self._preview_key = PageRenderCache.make_key(
+            doc_key, page_num, PLACEHOLDER_ZOOM, page.rotation
+        )
+
+        # Reuse cached render when revisiting, otherwise show a placeholder
+        pixmap = self.render_cache.get(self._page_key)
+        self._switch_started = None if pixmap is not None else start
+        INSTRUMENTATION.count("render_cache.miss" if pixmap is None else "render_cache.hit")
+        if pixmap is None:
+            pixmap = self.render_cache.get(self._preview_key)
+        if pixmap is None:
+            pixmap = QPixmap(max(1, int(rect.width * PLACEHOLDER_ZOOM)),
+                             max(1, int(rect.height * PLACEHOLDER_ZOOM)))
+            pixmap.fill(Qt.white)
 
         # Clear and update scene
+        self.tile_layer.reset()
         self.scene.clear()
+        self.item_index.clear()
         self.pdf_pixmap_item = None
-        self.text_boxes = []
+        self.signature_item = None
 
         # Add PDF as background
         self.pdf_pixmap_item = self.scene.addPixmap(pixmap)
         self.pdf_pixmap_item.setZValue(0)
+        self.pdf_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+        self._fit_page_pixmap(pixmap)
 
         # Set scene rect
-        self.scene.setSceneRect(0, 0, pixmap.width(), pixmap.height())
+        self.scene.setSceneRect(0, 0, self.pdf_width, self.pdf_height)
 
-        # Detect font from this page
-        self.detected_font = FontDetector.detect_font_properties(pdf_path, page_num)
+        self._schedule_renders(doc, doc_key, page_num)
+        self.tile_layer.schedule_update()
+
+        # Detect font (memoized; whole-document stats computed on a worker)
+        self.detected_font = None
+        if FONT_DETECTION_MODE == "document":
+            self.detected_font = FontDetector.document_font_properties(doc_key)
+            if self.detected_font is None and not self._font_stats_pending(doc_key):
+                self._queue_font_stats(0)
+        if self.detected_font is None:
+            self.detected_font = FontDetector.detect_font_properties(pdf_path, page_num)
 
-        doc.close()
         self.page_changed.emit(page_num)
 
+        # page.switch lasts until the full render is shown (now, if cached)
+        INSTRUMENTATION.record("page.load", time.perf_counter() - start)
+        if self._switch_started is None:
+            INSTRUMENTATION.record("page.switch", time.perf_counter() - start)
+
+    def _schedule_renders(self, doc, doc_key, page_num):
+        """Queue current page (preview + full) and N±1 prefetch renders."""
+        requests = []
+        if self._page_key not in self.render_cache:
+            if self._preview_key not in self.render_cache:
+                requests.append((self._preview_key, page_num, PLACEHOLDER_ZOOM))
+            requests.append((self._page_key, page_num, self.base_zoom))
+
+        for neighbour in (page_num + 1, page_num - 1):
+            if 0 <= neighbour < len(doc):
+                neighbour_page = doc[neighbour]
+                zoom = self._base_zoom(neighbour_page.rect)
+                key = PageRenderCache.make_key(
+                    doc_key, neighbour, zoom, neighbour_page.rotation
+                )
+                if key not in self.render_cache:
+                    requests.append((key, neighbour, zoom))
+
+        # Drop queued renders for pages the user navigated away from, and
+        # font stats for a document that is no longer shown
+        keep = [key for key, _, _ in requests]
+        if self._font_stats_key is not None and self._font_stats_key[1] == doc_key:
+            keep.append(self._font_stats_key)
+        self.render_pool.cancel_except(self, keep)
+
+        for key, num, zoom in requests:
+            full_page = zoom != PLACEHOLDER_ZOOM
+            disk_cache = DISK_RENDER_CACHE if (DISK_CACHE_FULL_PAGES or not full_page) else None
+            self.render_pool.submit(self, key, self.pdf_path, num, zoom, disk_cache=disk_cache)
+
+    def _base_zoom(self, rect):
+        """Page render scale, capped at MAX_PAGE_PIXELS."""
+        area = max(1.0, rect.width * rect.height)
+        return min(self.render_zoom, math.sqrt(MAX_PAGE_PIXELS / area))
+
+    def _fit_page_pixmap(self, pixmap):
+        """Scale the page pixmap item so it covers the page."""
+        if pixmap.width() > 0:
+            self.pdf_pixmap_item.setScale(self.pdf_width / pixmap.width())
+
+    def _on_page_rendered(self, owner, key, image):
+        """Cache a finished render and show it if it is for this page."""
+        if owner is not self:
+            return
+
+        with INSTRUMENTATION.timer("render.qpixmap"):
+            pixmap = QPixmap.fromImage(image)
+        self.render_cache.put(key, pixmap)
+
+        if self.pdf_pixmap_item is None:
+            return
+        if key == self._page_key or (
+                key == self._preview_key and self._page_key not in self.render_cache):
+            self.pdf_pixmap_item.setPixmap(pixmap)
+            self._fit_page_pixmap(pixmap)
+
+        if key == self._page_key and self._switch_started is not None:
+            INSTRUMENTATION.record("page.switch", time.perf_counter() - self._switch_started)
+            self._switch_started = None
+
+    def _on_render_failed(self, owner, key, error):
+        """Report a failed page render or font stats chunk."""
+        if owner is not self:
+            return
+
+        if key == self._font_stats_key:
+            # Per-page detection keeps working without document stats
+            self._font_stats_key = None
+            print(f"Error collecting font stats: {error}")
+            return
+
+        page_num = key[1]
+        print(f"Error rendering page {page_num + 1}: {error}")
+        if key == self._page_key:
+            self._switch_started = None
+            self.render_failed.emit(f"Could not render page {page_num + 1}: {error}")
+
+    def _font_stats_pending(self, doc_key):
+        key = self._font_stats_key
+        return key is not None and key[1] == doc_key and self.render_pool.is_pending(self, key)
+
+    def _queue_font_stats(self, first):
+        """Queue the next chunk of document font stats behind the renders.
+
+        One chunk is queued at a time, so a page switch waits for at most
+        FONT_STATS_CHUNK_PAGES pages of stats on the shared workers.
+        """
+        self._font_stats_key = ("fonts", self.doc_key, first)
+        self.render_pool.submit_task(
+            self, self._font_stats_key,
+            FontDetector.document_font_stats, self.pdf_path, first, FONT_STATS_CHUNK_PAGES
+        )
+
+    def _on_task_finished(self, owner, key, result):
+        """Store a chunk of document font stats and queue the next one."""
+        if owner is not self or key != self._font_stats_key:
+            return
+
+        doc_key, first, page_stats = result
+        next_page = first + len(page_stats)
+        complete = next_page >= self.total_pages
+        FontDetector.seed(doc_key, first, page_stats, complete)
+        if complete:
+            self._font_stats_key = None
+            self.detected_font = FontDetector.document_font_properties(doc_key)
+        else:
+            self._queue_font_stats(next_page)
+
     def add_signature(self, sign_path, position=None, scale=1.0):
         """Add signature to the PDF view."""
-        pixmap = QPixmap(sign_path)
-        if pixmap.isNull():
+        # Decoded and scaled once per image/scale, sharp at 100% zoom
+        scaled_pixmap = SIGNATURE_ASSETS.scaled_pixmap(sign_path, scale * VIEW_SCALE)
+        if scaled_pixmap.isNull():
             return False
 
-        # Scale signature
-        scaled_pixmap = pixmap.scaled(
-            int(pixmap.width() * scale),
-            int(pixmap.height() * scale),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-
         # Remove existing signature
         if self.signature_item:
             self.scene.removeItem(self.signature_item)
@@ -495,12 +1754,14 @@ class PDFGraphicsView(QGraphicsView):
             self.signature_item.setPos(position)
         else:
             # Default position: bottom right
+            size = self.signature_item.sceneBoundingRect()
             self.signature_item.setPos(
-                scene_rect.width() - scaled_pixmap.width() - 100,
-                scene_rect.height() - scaled_pixmap.height() - 100
+                scene_rect.width() - size.width() - 50,
+                scene_rect.height() - size.height() - 50
             )
 
         self.scene.addItem(self.signature_item)
+        self.item_index.add(self.signature_item, 'signature')
         return True
 
     def add_text_box(self, position=None, text="", font_props=None):
@@ -520,25 +1781,53 @@ class PDFGraphicsView(QGraphicsView):
         if position:
             text_item.setPos(position)
         else:
-            # Center of visible area
-            text_item.setPos(200, 200)
+            # Default spot, moved down past boxes already placed there
+            text_item.setPos(100, 100)
+            while self.item_index.overlapping(text_item, 'text_box') and \
+                    text_item.sceneBoundingRect().bottom() < self.scene.sceneRect().bottom():
+                text_item.moveBy(0, text_item.sceneBoundingRect().height())
 
-        self.scene.addItem(text_item)
-        self.text_boxes.append(text_item)
+        self.add_text_box_item(text_item)
 
         # Auto-enable editing
-        text_item._text_widget.text_edit.setFocus()
-        text_item._text_widget.text_edit.selectAll()
+        text_item.start_editing(select_all=True)
 
         self.text_boxes_changed.emit()
+        self.text_boxes_edited.emit()
         return text_item
 
+    def add_text_box_item(self, text_item):
+        """Add an existing text box item to the scene and the index."""
+        self.scene.addItem(text_item)
+        self.item_index.add(text_item, 'text_box')
+        text_item.edited.connect(self.text_boxes_edited)
+
+    def add_text_box_items(self, text_items):
+        """Add many text box items in one batch.
+
+        Items should already be positioned and sized. Viewport updates
+        are suspended while they are inserted and text_boxes_changed is
+        emitted once.
+        """
+        if not text_items:
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            for text_item in text_items:
+                self.scene.addItem(text_item)
+                self.item_index.add(text_item, 'text_box')
+                text_item.edited.connect(self.text_boxes_edited)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.viewport().update()
+        self.text_boxes_changed.emit()
+
     def get_text_boxes(self):
         """Get all text boxes."""
-        # Refresh from scene
-        self.text_boxes = [item for item in self.scene.items()
-                          if isinstance(item, PDFTextBoxItem)]
-        return self.text_boxes
+        return self.item_index.items('text_box')
+
+    def text_box_count(self):
+        return self.item_index.count('text_box')
 
     def get_signature_position(self):
         """Get current signature position."""
@@ -553,16 +1842,43 @@ class PDFGraphicsView(QGraphicsView):
                 self.signature_item = None
                 return None
 
-            pos = self.signature_item.pos()
-            return QPoint(int(pos.x()), int(pos.y()))
+            return QPointF(self.signature_item.pos())
         except (RuntimeError, AttributeError):
             # Item was deleted or is invalid
             self.signature_item = None
         return None
 
+    def set_zoom(self, zoom):
+        """Set view magnification (1.0 = VIEW_SCALE screen pixels per point)."""
+        self.view_zoom = max(MIN_VIEW_ZOOM, min(MAX_VIEW_ZOOM, zoom))
+        scale = VIEW_SCALE * self.view_zoom
+        self.setTransform(QTransform.fromScale(scale, scale))
+        self.tile_layer.schedule_update()
+
+    def zoom_in(self):
+        """Zoom in one step."""
+        self.set_zoom(self.view_zoom * 1.25)
+
+    def zoom_out(self):
+        """Zoom out one step."""
+        self.set_zoom(self.view_zoom / 1.25)
+
+    def resizeEvent(self, event):
+        """Cover the newly exposed area with tiles."""
+        super().resizeEvent(event)
+        self.tile_layer.schedule_update()
+
     def wheelEvent(self, event: QWheelEvent):
-        """Handle mouse wheel for smooth scrolling."""
+        """Handle mouse wheel for smooth scrolling (Ctrl+wheel zooms)."""
         delta = event.angleDelta().y()
+        if event.modifiers() & Qt.ControlModifier:
+            if delta > 0:
+                self.zoom_in()
+            elif delta < 0:
+                self.zoom_out()
+            event.accept()
+            return
+
         scroll_distance = -delta
 
         v_scroll = self.verticalScrollBar()
@@ -578,8 +1894,12 @@ class PDFGraphicsView(QGraphicsView):
             # Map to scene coordinates
             scene_pos = self.mapToScene(event.pos())
 
-            # Create new text box
-            self.add_text_box(position=scene_pos)
+            # Clicking an existing box edits it instead of stacking a new one
+            hits = self.item_index.items_at(scene_pos, 'text_box')
+            if hits:
+                hits[0].start_editing(select_all=True)
+            else:
+                self.add_text_box(position=scene_pos)
 
             # Exit text box mode
             self.text_box_mode = False
@@ -595,6 +1915,8 @@ class PDFScrollArea(QWidget):
 
     page_changed = pyqtSignal(int)
     text_boxes_changed = pyqtSignal()
+    text_boxes_edited = pyqtSignal()
+    render_failed = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -606,6 +1928,8 @@ class PDFScrollArea(QWidget):
         # Connect signals
         self.view.page_changed.connect(self.page_changed.emit)
         self.view.text_boxes_changed.connect(self.text_boxes_changed.emit)
+        self.view.text_boxes_edited.connect(self.text_boxes_edited.emit)
+        self.view.render_failed.connect(self.render_failed.emit)
 
         # Create a scroll area wrapper
         self.scroll_area = QScrollArea()
@@ -632,6 +1956,10 @@ class PDFScrollArea(QWidget):
         """Get all text boxes."""
         return self.view.get_text_boxes()
 
+    def text_box_count(self):
+        """Number of text boxes on the current page."""
+        return self.view.text_box_count()
+
     def get_signature_position(self):
         """Get signature position."""
         try:
@@ -669,16 +1997,193 @@ class PDFScrollArea(QWidget):
         return self.scroll_area.verticalScrollBar()
 
 
-# ==================== Settings Manager ====================
-class SettingsManager:
-    """Manage UI state and text boxes persistence."""
+# ==================== Annotation Store ====================
+class AnnotationStore:
+    """SQLite store of text boxes, one row per (document, page), and UI state.
+
+    Documents are identified by DocumentPool.fingerprint, so each PDF has
+    its own annotation set whatever its path.
+
+    The database runs in WAL mode, so a page save is a single-row upsert
+    in its own transaction instead of a rewrite of every annotation, and
+    a crash mid-write leaves the previous state intact. The connection
+    is opened lazily and may be used from any thread.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS text_boxes (
+            document_id TEXT NOT NULL,
+            page_num    INTEGER NOT NULL,
+            boxes       TEXT NOT NULL,
+            updated_at  TEXT NOT NULL,
+            PRIMARY KEY (document_id, page_num)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS ui_state (
+            document_id TEXT PRIMARY KEY,
+            state       TEXT NOT NULL,
+            updated_at  TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def connection(self):
+        """Open the database on first use."""
+        with self._lock:
+            if self._conn is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(self.SCHEMA)
+                conn.commit()
+                self._conn = conn
+            return self._conn
+
+    def save_page(self, document_id, page_num, text_boxes):
+        """Replace one page's text box dicts."""
+        self.save_pages(document_id, {page_num: text_boxes})
+
+    def save_pages(self, document_id, pages):
+        """Replace several pages ({page_num: [dicts]}) in one transaction."""
+        with INSTRUMENTATION.timer("annotations.save"):
+            self._save_pages(document_id, pages)
+
+    def _save_pages(self, document_id, pages):
+        timestamp = datetime.now().isoformat()
+        rows = [
+            (document_id, int(page_num), json.dumps(boxes, ensure_ascii=False), timestamp)
+            for page_num, boxes in pages.items()
+        ]
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO text_boxes (document_id, page_num, boxes, updated_at) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (document_id, page_num) DO UPDATE SET "
+                    "boxes = excluded.boxes, updated_at = excluded.updated_at",
+                    rows
+                )
+
+    def load_page(self, document_id, page_num):
+        """Return {'page_num', 'text_boxes', 'timestamp'} or None."""
+        with self._lock:
+            row = self.connection().execute(
+                "SELECT page_num, boxes, updated_at FROM text_boxes "
+                "WHERE document_id = ? AND page_num = ?",
+                (document_id, int(page_num))
+            ).fetchone()
+        return self._page_entry(row) if row else None
+
+    def load_document(self, document_id):
+        """Return all pages as {str(page_num): entry}, like text_boxes.json."""
+        with INSTRUMENTATION.timer("annotations.load"):
+            with self._lock:
+                rows = self.connection().execute(
+                    "SELECT page_num, boxes, updated_at FROM text_boxes "
+                    "WHERE document_id = ? ORDER BY page_num",
+                    (document_id,)
+                ).fetchall()
+            return {str(row[0]): self._page_entry(row) for row in rows}
+
+    def has_document(self, document_id):
+        """Whether any page of the document is stored."""
+        with self._lock:
+            row = self.connection().execute(
+                "SELECT 1 FROM text_boxes WHERE document_id = ? LIMIT 1",
+                (document_id,)
+            ).fetchone()
+        return row is not None
+
+    def save_state(self, document_id, state):
+        """Replace the UI state dict of a document."""
+        with INSTRUMENTATION.timer("state.save"), self._lock:
+            conn = self.connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO ui_state (document_id, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (document_id) DO UPDATE SET "
+                    "state = excluded.state, updated_at = excluded.updated_at",
+                    (document_id, json.dumps(state, ensure_ascii=False),
+                     datetime.now().isoformat())
+                )
+
+    def load_state(self, document_id):
+        """Return the UI state dict of a document, or None."""
+        with INSTRUMENTATION.timer("state.load"):
+            with self._lock:
+                row = self.connection().execute(
+                    "SELECT state FROM ui_state WHERE document_id = ?", (document_id,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def rename_document(self, old_id, new_id):
+        """Move all data of old_id to new_id, unless new_id has data."""
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                for table in ("text_boxes", "ui_state"):
+                    exists = conn.execute(
+                        f"SELECT 1 FROM {table} WHERE document_id = ? LIMIT 1", (new_id,)
+                    ).fetchone()
+                    if not exists:
+                        conn.execute(
+                            f"UPDATE {table} SET document_id = ? WHERE document_id = ?",
+                            (new_id, old_id)
+                        )
 
-    @staticmethod
-    def save_state(scroll_pos, signature_pos, zoom, current_page, total_pages):
-        """Save UI state to JSON file."""
+    def import_json(self, json_path, document_id):
+        """Import a text_boxes.json file; return the number of pages."""
+        data = SettingsManager.read_text_boxes_file(json_path)
+        pages = {
+            int(page_key): page_data.get('text_boxes', [])
+            for page_key, page_data in data.items()
+        }
+        self.save_pages(document_id, pages)
+        return len(pages)
+
+    def close(self):
+        """Close the connection (reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _page_entry(row):
+        page_num, boxes, updated_at = row
+        return {
+            'page_num': page_num,
+            'text_boxes': json.loads(boxes),
+            'timestamp': updated_at
+        }
+
+
+ANNOTATION_STORE = AnnotationStore(ANNOTATION_DB)
+
+
+# ==================== Settings Manager ====================
+class SettingsManager:
+    """Manage UI state and text boxes persistence, per document.
+
+    document_id is the document's content fingerprint (see
+    DocumentPool.fingerprint); DEFAULT_DOCUMENT_ID is used when none is
+    given.
+    """
+
+    @staticmethod
+    def save_state(scroll_pos, signature_pos, zoom, current_page, total_pages,
+                   document_id=DEFAULT_DOCUMENT_ID):
+        """Save UI state of a document."""
         state = {
             'scroll_position': scroll_pos,
-            'signature_position': {'x': signature_pos.x(), 'y': signature_pos.y()} if signature_pos else None,
+            'signature_position': {'x': signature_pos.x(), 'y': signature_pos.y(), 'unit': 'pt'} if signature_pos else None,
             'zoom_level': zoom,
             'current_page': current_page,
             'total_pages': total_pages,
@@ -686,100 +2191,924 @@ class SettingsManager:
         }
 
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
+            ANNOTATION_STORE.save_state(document_id, state)
             return True, "保存成功"
         except Exception as e:
             return False, f"保存失败: {str(e)}"
 
     @staticmethod
-    def load_state():
-        """Load UI state from JSON file."""
+    def load_state(document_id=DEFAULT_DOCUMENT_ID):
+        """Load UI state of a document; the signature position is in points."""
         try:
-            if os.path.exists(STATE_FILE):
-                with open(STATE_FILE, 'r') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        return None
+            state = ANNOTATION_STORE.load_state(document_id)
+        except Exception as e:
+            print(f"Failed to load state: {e}")
+            return None
+
+        position = state and state.get('signature_position')
+        if position and position.get('unit') != 'pt':
+            # Saved as scene pixels of the fixed-zoom scene
+            state['signature_position'] = {
+                'x': position['x'] / LEGACY_SCENE_ZOOM,
+                'y': position['y'] / LEGACY_SCENE_ZOOM,
+                'unit': 'pt'
+            }
+        return state
 
     @staticmethod
-    def save_text_boxes(text_boxes, page_num):
-        """Save text boxes to JSON file (supports multiple pages)."""
-        # Load existing data
-        all_data = {}
-        if os.path.exists(TEXT_BOXES_FILE):
-            try:
-                with open(TEXT_BOXES_FILE, 'r') as f:
-                    all_data = json.load(f)
-            except Exception:
-                all_data = {}
+    def migrate_legacy(document_id):
+        """Move pre-fingerprint data (global JSON files or the default
+        annotation set) to document_id, if it has no data yet."""
+        store = ANNOTATION_STORE
+        try:
+            if store.has_document(DEFAULT_DOCUMENT_ID) or store.load_state(DEFAULT_DOCUMENT_ID):
+                store.rename_document(DEFAULT_DOCUMENT_ID, document_id)
+            if not store.has_document(document_id) and os.path.exists(TEXT_BOXES_FILE):
+                pages = store.import_json(TEXT_BOXES_FILE, document_id)
+                print(f"INFO Imported {pages} pages of text boxes from {TEXT_BOXES_FILE}")
+            if store.load_state(document_id) is None and os.path.exists(STATE_FILE):
+                with open(STATE_FILE, 'r') as f:
+                    store.save_state(document_id, json.load(f))
+        except Exception as e:
+            print(f"Failed to import saved settings: {e}")
 
-        # Update current page's text boxes
-        all_data[str(page_num)] = {
-            'page_num': page_num,
-            'text_boxes': [tb.to_dict() for tb in text_boxes],
-            'timestamp': datetime.now().isoformat()
-        }
+    @staticmethod
+    def save_text_boxes(text_boxes, page_num, document_id=DEFAULT_DOCUMENT_ID):
+        """Save text boxes of one page."""
+        return SettingsManager.save_text_boxes_from_dicts(
+            [tb.to_dict() for tb in text_boxes], page_num, document_id
+        )
 
+    @staticmethod
+    def save_text_boxes_from_dicts(text_boxes_dicts, page_num, document_id=DEFAULT_DOCUMENT_ID):
+        """Save text boxes of one page from a dictionary list."""
         try:
-            with open(TEXT_BOXES_FILE, 'w') as f:
-                json.dump(all_data, f, indent=2)
+            ANNOTATION_STORE.save_page(document_id, page_num, text_boxes_dicts)
             return True
         except Exception as e:
             print(f"Failed to save text boxes: {e}")
             return False
 
     @staticmethod
-    def save_text_boxes_from_dicts(text_boxes_dicts, page_num):
-        """Save text boxes from dictionary list (supports multiple pages)."""
-        # Load existing data
-        all_data = {}
-        if os.path.exists(TEXT_BOXES_FILE):
-            try:
-                with open(TEXT_BOXES_FILE, 'r') as f:
-                    all_data = json.load(f)
-            except Exception:
-                all_data = {}
+    def load_text_boxes(page_num=None, document_id=DEFAULT_DOCUMENT_ID):
+        """Load saved text boxes of a document.
+        If page_num is specified, only return text boxes for that page.
+        Otherwise, return all pages' text boxes.
+        """
+        try:
+            if page_num is not None:
+                return ANNOTATION_STORE.load_page(document_id, page_num)
+            return ANNOTATION_STORE.load_document(document_id)
+        except Exception as e:
+            print(f"Failed to load text boxes: {e}")
+        return None
 
-        # Update current page's text boxes
-        all_data[str(page_num)] = {
-            'page_num': page_num,
-            'text_boxes': text_boxes_dicts,
-            'timestamp': datetime.now().isoformat()
+    @staticmethod
+    def read_text_boxes_file(path):
+        """Read a text boxes file: {page: {'text_boxes': [...], ...}}."""
+        with INSTRUMENTATION.timer("json.load"), open(path, 'r') as f:
+            return json.load(f)
+
+
+# ==================== Text Box Import ====================
+def text_box_from_row(row, line=None):
+    """Turn one import row into (page_num, text box dict).
+
+    Rows have 'page' (1-based), 'x', 'y' (PDF points from the top-left)
+    and 'text', and optionally 'font_family', 'font_size', 'width' and
+    'height' (points). Empty values fall back to defaults.
+    """
+    where = f" (row {line})" if line is not None else ""
+
+    def number(key, default=None, cast=float):
+        value = row.get(key)
+        if value is None or value == "":
+            if default is None:
+                raise ValueError(f"missing '{key}'{where}")
+            return default
+        try:
+            return cast(float(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid '{key}': {value!r}{where}")
+
+    page = number('page', cast=int)
+    if page < 1:
+        raise ValueError(f"'page' must be 1 or more{where}")
+
+    text_box = {
+        'text': str(row.get('text') or ''),
+        'x': number('x'),
+        'y': number('y'),
+        'font_family': row.get('font_family') or 'Helvetica',
+        'font_size': number('font_size', 12, int),
+    }
+    for key, default in (('width', 100), ('height', 30)):
+        text_box[key] = number(key, default, int)
+    return page - 1, text_box
+
+
+def text_box_fields_from_data(data):
+    """Normalize imported data to {page_num: [text box dicts]}.
+
+    Accepts the text_boxes.json layout ({page_num: {'text_boxes': [...]}},
+    0-based keys) or a list of rows as described in text_box_from_row().
+    """
+    if isinstance(data, dict):
+        return {
+            int(page_key): [
+                PDFTextBoxItem.normalized_dict(text_box)
+                for text_box in page_data.get('text_boxes', [])
+            ]
+            for page_key, page_data in data.items()
         }
 
+    fields = {}
+    for line, row in enumerate(data, 1):
+        page_num, text_box = text_box_from_row(row, line)
+        fields.setdefault(page_num, []).append(text_box)
+    return fields
+
+
+def read_text_box_fields(path):
+    """Read text boxes to import from a .csv or .json file."""
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        # Line numbers in errors count the header row
+        fields = {}
+        for line, row in enumerate(rows, 2):
+            page_num, text_box = text_box_from_row(row, line)
+            fields.setdefault(page_num, []).append(text_box)
+        return fields
+
+    return text_box_fields_from_data(SettingsManager.read_text_boxes_file(path))
+
+
+# ==================== Annotation Model ====================
+class AnnotationModel(QObject):
+    """In-memory text boxes of the open document, with autosave.
+
+    All pages are loaded once when a document is opened and the model is
+    the source of truth from then on: page switches and exports read and
+    write memory only. Changed pages are marked dirty and written to the
+    annotation store on a single background thread, AUTOSAVE_DELAY_MS
+    after the last change, so the UI never waits for disk I/O.
+    """
+
+    saved = pyqtSignal(int)        # number of pages written
+    save_failed = pyqtSignal(str)
+
+    _write_done = pyqtSignal(str, object, str)  # document_id, pages, error
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store or ANNOTATION_STORE
+        self.document_id = None
+        self._pages = {}   # page_num -> [text box dicts]
+        self._dirty = set()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(AUTOSAVE_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+        self._write_done.connect(self._on_write_done)
+
+    def load(self, document_id):
+        """Switch to a document, scheduling unsaved edits of the previous one."""
+        self.flush()
+        self.document_id = document_id
+        self._pages = {}
         try:
-            with open(TEXT_BOXES_FILE, 'w') as f:
-                json.dump(all_data, f, indent=2)
-            return True
+            for page_key, page_data in self.store.load_document(document_id).items():
+                # Older saves are converted once here, so the model only holds points
+                self._pages[int(page_key)] = [
+                    PDFTextBoxItem.normalized_dict(text_box)
+                    for text_box in page_data.get('text_boxes', [])
+                ]
         except Exception as e:
+            print(f"Failed to load text boxes: {e}")
+
+    def page(self, page_num):
+        """Text box dicts of a page (do not modify)."""
+        return self._pages.get(page_num, [])
+
+    def pages(self):
+        """{page_num: [text box dicts]} for all pages with entries."""
+        return dict(self._pages)
+
+    def set_page(self, page_num, text_boxes):
+        """Replace a page's text boxes and schedule an autosave."""
+        text_boxes = list(text_boxes)
+        if self._pages.get(page_num, []) == text_boxes:
+            return
+        self._pages[page_num] = text_boxes
+        self._dirty.add(page_num)
+        self._timer.start()
+
+    def flush(self, wait=False):
+        """Write dirty pages now (in the background unless wait=True)."""
+        self._timer.stop()
+        future = None
+        if self._dirty and self.document_id is not None:
+            pages = {page_num: self._pages[page_num] for page_num in self._dirty}
+            self._dirty = set()
+            future = self._writer.submit(self._write, self.document_id, pages)
+        if wait:
+            if future is not None:
+                future.result()
+            else:
+                self._writer.submit(lambda: None).result()
+
+    def close(self):
+        """Write pending edits and stop the writer thread."""
+        self.flush()
+        self._writer.shutdown(wait=True)
+
+    def _write(self, document_id, pages):
+        # Runs on the writer thread
+        try:
+            self.store.save_pages(document_id, pages)
+            error = ""
+        except Exception as e:
+            error = str(e)
             print(f"Failed to save text boxes: {e}")
-            return False
+        self._write_done.emit(document_id, pages, error)
+
+    def _on_write_done(self, document_id, pages, error):
+        if not error:
+            self.saved.emit(len(pages))
+            return
+        # Retry failed pages with the next save unless edited meanwhile
+        if document_id == self.document_id:
+            for page_num in pages:
+                if self._pages.get(page_num) is pages[page_num]:
+                    self._dirty.add(page_num)
+            self._timer.start()
+        self.save_failed.emit(error)
+
+
+# ==================== Signature Assets ====================
+class SignatureAssets:
+    """Decode-once registry for signature images.
+
+    Each image file is decoded once into a QPixmap, scaled variants are
+    cached per scale, and the raw file bytes are kept for export, where
+    PDFExporter embeds them as one image XObject shared by every page the
+    signature is placed on. Entries are refreshed when the file changes.
+    """
+
+    def __init__(self):
+        self._entries = {}  # path -> {'key', 'pixmap', 'scaled', 'stream', 'image_size'}
+
+    def pixmap(self, path):
+        """Original image as QPixmap (null pixmap if unreadable)."""
+        entry = self._entry(path)
+        if entry['pixmap'] is None:
+            entry['pixmap'] = QPixmap(path)
+        return entry['pixmap']
+
+    def scaled_pixmap(self, path, scale):
+        """Image scaled by a factor, cached per scale."""
+        entry = self._entry(path)
+        scaled = entry['scaled'].get(scale)
+        if scaled is None:
+            pixmap = self.pixmap(path)
+            if pixmap.isNull():
+                return pixmap
+            scaled = pixmap.scaled(
+                int(pixmap.width() * scale),
+                int(pixmap.height() * scale),
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            entry['scaled'][scale] = scaled
+        return scaled
+
+    def image_size(self, path):
+        """Image size in pixels as (width, height), decoded without Qt."""
+        entry = self._entry(path)
+        if entry['image_size'] is None:
+            pix = fitz.Pixmap(self.stream(path))
+            entry['image_size'] = (pix.width, pix.height)
+        return entry['image_size']
+
+    def stream(self, path):
+        """Raw image file bytes for embedding in PDFs."""
+        entry = self._entry(path)
+        if entry['stream'] is None:
+            with open(path, 'rb') as f:
+                entry['stream'] = f.read()
+        return entry['stream']
+
+    def _entry(self, path):
+        try:
+            stat = os.stat(path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+
+        entry = self._entries.get(path)
+        if entry is None or entry['key'] != key:
+            entry = {'key': key, 'pixmap': None, 'scaled': {}, 'stream': None,
+                     'image_size': None}
+            self._entries[path] = entry
+        return entry
+
+
+SIGNATURE_ASSETS = SignatureAssets()
+
+
+# ==================== PDF Export ====================
+def process_rss():
+    """Current resident set size in bytes, or None if unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def draw_overlay_reportlab(c, page_width, page_height, text_boxes=(), images=()):
+    """Draw text boxes and images on the current reportlab canvas page.
+
+    Text box and image coordinates are PDF points from the top-left
+    corner; they are flipped to reportlab's bottom-left origin here.
+    """
+    for tb_dict in text_boxes:
+        try:
+            tb_text = tb_dict.get('text', '')
+            tb_font_family = tb_dict.get('font_family', 'Helvetica')
+            tb_font_size = tb_dict.get('font_size', 12)
+            tb_pos_x = tb_dict.get('x', 0)
+            tb_pos_y = tb_dict.get('y', 0)
+
+            # Calculate final Y (reportlab coordinates from bottom)
+            final_y = page_height - tb_pos_y - tb_font_size
+
+            # Set font (fallback to Helvetica if font not found)
+            try:
+                c.setFont(tb_font_family, tb_font_size)
+            except:
+                c.setFont('Helvetica', tb_font_size)
+
+            c.setFillColorRGB(0, 0, 0)
+
+            # Draw text
+            c.drawString(tb_pos_x, final_y, tb_text)
+        except Exception as e:
+            print(f"Error adding text box: {e}")
+
+    for image in images:
+        try:
+            final_y = page_height - image['y'] - image['height']
+            source = image['path']
+            if image.get('stream') is not None:
+                source = ImageReader(io.BytesIO(image['stream']))
+            c.drawImage(
+                source,
+                image['x'],
+                final_y,
+                image['width'],
+                image['height'],
+                preserveAspectRatio=True,
+                mask='auto'
+            )
+        except Exception as e:
+            print(f"Error adding image: {e}")
+
+
+class ReportlabOverlayBackend:
+    """Draw overlays with reportlab and stamp them with show_pdf_page.
+
+    All target pages are drawn into a single reportlab document (one page
+    per target), which is parsed once and stamped in one pass.
+    """
+
+    name = "reportlab"
+
+    def apply(self, doc, overlays, page_done=None):
+        """Stamp [(page_num, overlay), ...] onto doc.
+
+        page_done() is called after each page is stamped.
+        """
+        if not overlays:
+            return
+
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet)
+        for page_num, overlay in overlays:
+            box = doc[page_num].mediabox
+            c.setPageSize((box.width, box.height))
+            draw_overlay_reportlab(
+                c, box.width, box.height, overlay['text_boxes'], overlay['images']
+            )
+            c.showPage()
+        c.save()
+
+        overlay_doc = fitz.open("pdf", packet.getvalue())
+        try:
+            for index, (page_num, _) in enumerate(overlays):
+                page = doc[page_num]
+                box = page.mediabox
+                page.show_pdf_page(fitz.Rect(0, 0, box.width, box.height), overlay_doc, index)
+                if page_done:
+                    page_done()
+        finally:
+            overlay_doc.close()
+
+
+class NativeOverlayBackend:
+    """Draw overlays straight into the page content with PyMuPDF.
+
+    All text boxes of a page go through one Shape, so fonts are registered
+    and the content stream is rewritten once per page, not once per box.
+    Each distinct image is decoded and embedded once; later placements
+    reference the same image XObject, also across the apply() calls of a
+    chunked export (xrefs stay valid when the output is reopened).
+    """
+
+    name = "native"
+
+    def __init__(self):
+        self.image_xrefs = {}  # image path -> xref of its embedded XObject
+
+    # Text box font family -> PyMuPDF built-in font
+    FONT_NAMES = {
+        'helvetica': 'helv',
+        'arial': 'helv',
+        'times-roman': 'tiro',
+        'times new roman': 'tiro',
+        'courier': 'cour',
+        'courier new': 'cour',
+        'simsun': 'china-s',
+        'simhei': 'china-s',
+    }
+
+    def apply(self, doc, overlays, page_done=None):
+        """Draw [(page_num, overlay), ...] onto doc.
+
+        page_done() is called after each page is drawn.
+        """
+        image_xrefs = self.image_xrefs
+
+        for page_num, overlay in overlays:
+            page = doc[page_num]
+
+            if overlay['text_boxes']:
+                shape = page.new_shape()
+                for tb_dict in overlay['text_boxes']:
+                    try:
+                        self.draw_text_box(shape, tb_dict)
+                    except Exception as e:
+                        print(f"Error adding text box: {e}")
+                shape.commit()
+
+            for image in overlay['images']:
+                try:
+                    rect = fitz.Rect(
+                        image['x'], image['y'],
+                        image['x'] + image['width'], image['y'] + image['height']
+                    )
+                    xref = image_xrefs.get(image['path'])
+                    if xref:
+                        page.insert_image(rect, xref=xref, keep_proportion=True)
+                    elif image.get('stream') is not None:
+                        image_xrefs[image['path']] = page.insert_image(
+                            rect, stream=image['stream'], keep_proportion=True
+                        )
+                    else:
+                        image_xrefs[image['path']] = page.insert_image(
+                            rect, filename=image['path'], keep_proportion=True
+                        )
+                except Exception as e:
+                    print(f"Error adding image: {e}")
+
+            if page_done:
+                page_done()
+
+    @classmethod
+    def draw_text_box(cls, shape, tb_dict, text=None):
+        """Add one text box to a page Shape; text overrides tb_dict['text']."""
+        if text is None:
+            text = tb_dict.get('text', '')
+        font_size = tb_dict.get('font_size', 12)
+        # y is the top of the box; insert_text wants the baseline
+        point = (tb_dict.get('x', 0), tb_dict.get('y', 0) + font_size)
+        shape.insert_text(
+            point, text,
+            fontname=cls.font_name(tb_dict.get('font_family', 'Helvetica'), text),
+            fontsize=font_size,
+            color=(0, 0, 0)
+        )
+
+    @classmethod
+    def font_name(cls, family, text=""):
+        """Pick a built-in font; CJK text always gets the CJK font."""
+        name = cls.FONT_NAMES.get(family.lower(), 'helv')
+        if name != 'china-s' and any(ord(ch) > 0xFF for ch in text):
+            name = 'china-s'
+        return name
+
+
+OVERLAY_BACKENDS = {
+    backend.name: backend
+    for backend in (NativeOverlayBackend, ReportlabOverlayBackend)
+}
+
+
+class ExportCancelled(Exception):
+    """Raised from an export progress callback to stop the export."""
+
+
+def record_export_timings(timings, total):
+    """Add one export's PDFExporter.timings and total seconds to INSTRUMENTATION."""
+    for name, seconds in timings.items():
+        INSTRUMENTATION.record(f"export.{name}", seconds)
+    INSTRUMENTATION.record("export.total", total)
+
+
+def format_timings(timings):
+    """One-line summary of {name: seconds}, e.g. "open 4 ms · write 2 ms"."""
+    return " · ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items())
+
+
+class TextBoxStage:
+    """Export stage that draws text boxes (see PDFTextBoxItem.to_dict).
+
+    Export stages are objects with a name and overlays(page_count), which
+    returns {page_num: {'text_boxes': [...], 'images': [...]}} for the
+    pages it draws on. PDFExporter draws them in order and times each.
+    """
+
+    name = "text_boxes"
+
+    def __init__(self, pages=None):
+        self._pages = {}  # page_num -> [text box dicts]
+        for page_num, text_boxes in (pages or {}).items():
+            self.add(page_num, text_boxes)
+
+    def add(self, page_num, text_boxes):
+        self._pages.setdefault(page_num, []).extend(text_boxes)
+
+    def overlays(self, page_count):
+        return {
+            page_num: {'text_boxes': text_boxes, 'images': []}
+            for page_num, text_boxes in self._pages.items()
+            if text_boxes and 0 <= page_num < page_count
+        }
+
+
+class ImageStage:
+    """Export stage that places images, e.g. the signature or stamps.
+
+    A negative page_num counts from the end (-1 is the last page).
+    """
+
+    def __init__(self, name="images"):
+        self.name = name
+        self._pages = {}  # page_num -> [image dicts]
+
+    def add(self, page_num, image_path, x, y, width, height, stream=None):
+        """Place an image at (x, y) with the given size.
+
+        Pass the already-loaded file bytes as stream (see SignatureAssets)
+        to avoid reading the file again.
+        """
+        self._pages.setdefault(page_num, []).append({
+            'path': image_path,
+            'stream': stream,
+            'x': x,
+            'y': y,
+            'width': width,
+            'height': height
+        })
+
+    def overlays(self, page_count):
+        overlays = {}
+        for page_num, images in self._pages.items():
+            if page_num < 0:
+                page_num += page_count
+            if 0 <= page_num < page_count:
+                overlay = overlays.setdefault(page_num, {'text_boxes': [], 'images': []})
+                overlay['images'].extend(images)
+        return overlays
+
+
+class PDFExporter:
+    """Export pipeline: draw overlay stages into a copy of a PDF.
+
+    Stages (TextBoxStage, ImageStage or anything with the same interface)
+    are drawn in one pass over the overlaid pages, in the order added.
+    By default the source file is copied byte for byte and only the pages
+    that received overlays are written, as an incremental (append-only)
+    update section; untouched pages are kept by reference, so export time
+    and I/O scale with the number of annotated pages rather than document
+    size. full_rewrite=True writes the whole document instead, with
+    garbage collection and compression. Coordinates are PDF points from
+    the top-left corner of the page. backend selects how overlays are
+    drawn (see OVERLAY_BACKENDS).
+
+    Incremental exports are streamed in chunks of chunk_pages overlaid
+    pages: each chunk is appended to the output and the document is
+    reopened, so memory stays flat however many pages are annotated.
+    While the process RSS is above memory_limit, chunks are halved.
+
+    The output is written to temp_path and renamed over output_path only
+    when complete. progress(done, total) is called after each page of
+    each stage; raising ExportCancelled from it stops the export and
+    leaves output_path untouched. After export(), timings holds seconds
+    spent per step: 'open', 'unshare' (private page resources), one entry
+    per stage name, and 'write'.
+    """
+
+    def __init__(self, source_path, output_path, full_rewrite=False, backend=None,
+                 chunk_pages=None, memory_limit=None, progress=None, stages=None):
+        self.source_path = source_path
+        self.output_path = output_path
+        self.full_rewrite = full_rewrite
+        self.backend = OVERLAY_BACKENDS[backend or OVERLAY_BACKEND]()
+        self.chunk_pages = chunk_pages or EXPORT_CHUNK_PAGES
+        self.memory_limit = memory_limit or EXPORT_MEMORY_LIMIT
+        self.progress = progress
+        self.stages = list(stages or [])
+        self.timings = OrderedDict()
+
+    def add_stage(self, stage):
+        """Append an overlay stage and return it."""
+        self.stages.append(stage)
+        return stage
+
+    def add_text_boxes(self, page_num, text_boxes):
+        """Queue text box dicts for a page (on the "text_boxes" stage)."""
+        self._stage(TextBoxStage.name, TextBoxStage).add(page_num, text_boxes)
+
+    def add_image(self, page_num, image_path, x, y, width, height, stream=None):
+        """Queue an image for a page (on the "images" stage)."""
+        self._stage("images", ImageStage).add(
+            page_num, image_path, x, y, width, height, stream=stream
+        )
+
+    @property
+    def temp_path(self):
+        """Where the output is written before it is renamed into place."""
+        directory, name = os.path.split(self.output_path)
+        return os.path.join(directory, f".{name}.part")
+
+    def export(self):
+        """Write the output file; return the number of pages modified."""
+        temp_path = self.temp_path
+        start = time.perf_counter()
+        try:
+            pages = self._export(temp_path)
+            os.replace(temp_path, self.output_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        record_export_timings(self.timings, time.perf_counter() - start)
+        return pages
+
+    def _export(self, path):
+        self.timings = OrderedDict()
+        # Backends keep per-document state (e.g. embedded image xrefs)
+        self.backend = type(self.backend)()
+        with self._timed('open'):
+            doc = None
+            incremental = not self.full_rewrite
+            if incremental:
+                shutil.copyfile(self.source_path, path)
+                doc = fitz.open(path)
+                if not doc.can_save_incrementally():
+                    # E.g. repaired files - fall back to a full rewrite
+                    doc.close()
+                    doc = None
+                    incremental = False
+
+            if doc is None:
+                doc = fitz.open(self.source_path)
+
+        stage_overlays = []
+        for stage in self.stages:
+            with self._timed(stage.name):
+                stage_overlays.append((stage.name, stage.overlays(len(doc))))
+        pages = sorted(set().union(*(overlays for _, overlays in stage_overlays)))
+        self._done = 0
+        self._total = sum(len(overlays) for _, overlays in stage_overlays)
+
+        if incremental:
+            self._export_chunked(doc, pages, stage_overlays, path)
+        else:
+            try:
+                self._draw(doc, pages, stage_overlays)
+                with self._timed('write'):
+                    doc.save(path, garbage=2, deflate=True)
+            finally:
+                doc.close()
+
+        return len(pages)
+
+    def _draw(self, doc, pages, stage_overlays):
+        """Draw each stage's overlays on pages, one stage at a time."""
+        with self._timed('unshare'):
+            for page_num in pages:
+                self.unshare_resources(doc, doc[page_num])
+        for name, overlays in stage_overlays:
+            chunk = [(page_num, overlays[page_num]) for page_num in pages if page_num in overlays]
+            if chunk:
+                with self._timed(name):
+                    self.backend.apply(doc, chunk, self._page_done)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
 
     @staticmethod
-    def load_text_boxes(page_num=None):
-        """Load text boxes from JSON file.
-        If page_num is specified, only return text boxes for that page.
-        Otherwise, return all pages' text boxes.
+    def unshare_resources(doc, page):
+        """Give a page private copies of indirect resource dictionaries.
+
+        Many producers point every page at one resource object. Each
+        overlay adds new font and XObject names to it, so without a
+        private copy every page's resources (and the time to scan them)
+        grow with the number of pages exported.
+        """
+        for key in ("Resources", "Resources/Font", "Resources/XObject"):
+            kind, value = doc.xref_get_key(page.xref, key)
+            if kind == "xref":
+                doc.xref_set_key(page.xref, key,
+                                 doc.xref_object(int(value.split()[0]), compressed=True))
+
+    def _page_done(self):
+        self._done += 1
+        if self.progress:
+            self.progress(self._done, self._total)
+
+    def _export_chunked(self, doc, pages, stage_overlays, path):
+        """Draw pages chunk by chunk, appending each to the file at path.
+
+        doc is reopened between chunks; the current one is closed on return.
         """
+        chunk_pages = self.chunk_pages
+        start = 0
         try:
-            if os.path.exists(TEXT_BOXES_FILE):
-                with open(TEXT_BOXES_FILE, 'r') as f:
-                    all_data = json.load(f)
-
-                if page_num is not None:
-                    # Return only the specified page's data
-                    page_key = str(page_num)
-                    if page_key in all_data:
-                        return all_data[page_key]
-                    return None
-                else:
-                    # Return all data
-                    return all_data
-        except Exception:
-            pass
-        return None
+            while start < len(pages):
+                chunk = pages[start:start + chunk_pages]
+                self._draw(doc, chunk, stage_overlays)
+                with self._timed('write'):
+                    doc.saveIncr()
+                start += len(chunk)
+
+                if start < len(pages):
+                    # Drop parsed objects and MuPDF's cache before the next chunk
+                    with self._timed('write'):
+                        doc.close()
+                        fitz.TOOLS.store_shrink(100)
+                        doc = fitz.open(path)
+
+                    rss = process_rss()
+                    if rss is not None and rss > self.memory_limit:
+                        chunk_pages = max(1, chunk_pages // 2)
+        finally:
+            doc.close()
+
+    def _stage(self, name, factory):
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        return self.add_stage(factory())
+
+
+def run_export_process(exporter, messages, cancel_event):
+    """Run exporter.export() in an export process (see ExportWorker).
+
+    Reports ('progress', done, total), then one of ('finished', pages, timings),
+    ('cancelled',) or ('failed', error, traceback) through messages.
+    """
+    def progress(done, total):
+        if cancel_event.is_set():
+            raise ExportCancelled()
+        messages.put(('progress', done, total))
+
+    exporter.progress = progress
+    try:
+        pages = exporter.export()
+        messages.put(('finished', pages, dict(exporter.timings)))
+    except ExportCancelled:
+        messages.put(('cancelled',))
+    except Exception as e:
+        messages.put(('failed', f"{type(e).__name__}: {e}", traceback.format_exc()))
+
+
+class ExportWorker(QObject):
+    """Run a PDFExporter in a separate process and report via signals.
+
+    Like page renders, exports run in a spawned process because PyMuPDF
+    holds the GIL, so the window stays usable meanwhile. Messages are
+    polled from a queue by a timer. cancel() stops the export at the next
+    page; the exporter's temp file is dropped and the output untouched.
+    """
+
+    progress = pyqtSignal(int, int)     # stage pages done, total
+    finished = pyqtSignal(int, object)  # pages modified, PDFExporter.timings
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    POLL_MS = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._process = None
+        self._messages = None
+        self._cancel_event = None
+        self._temp_path = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.POLL_MS)
+        self._timer.timeout.connect(self._poll)
+
+    def is_running(self):
+        return self._process is not None
+
+    def start(self, exporter):
+        """Start exporting; the exporter is copied to the export process."""
+        if self.is_running():
+            raise RuntimeError("an export is already running")
+        context = multiprocessing.get_context("spawn")
+        self._messages = context.Queue()
+        self._cancel_event = context.Event()
+        self._temp_path = exporter.temp_path
+        self._process = context.Process(
+            target=run_export_process,
+            args=(exporter, self._messages, self._cancel_event),
+            daemon=True
+        )
+        self._process.start()
+        self._timer.start()
+
+    def cancel(self):
+        """Ask a running export to stop; cancelled is emitted once it has."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def shutdown(self, timeout=5.0):
+        """Cancel a running export and wait for its process to exit."""
+        if not self.is_running():
+            return
+        self.cancel()
+        deadline = time.monotonic() + timeout
+        while self._process.is_alive() and time.monotonic() < deadline:
+            # Keep the queue drained so the process can flush and exit
+            self._drain()
+            self._process.join(0.05)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._finish()
+
+    def _drain(self):
+        """Read queued messages; return (last progress, final message)."""
+        progress = None
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return progress, None
+            if message[0] != 'progress':
+                return progress, message
+            progress = message
+
+    def _poll(self):
+        alive = self._process.is_alive()
+        progress, message = self._drain()
+        if progress:
+            self.progress.emit(progress[1], progress[2])
+
+        if message:
+            self._finish()
+            if message[0] == 'finished':
+                self.finished.emit(message[1], message[2])
+            elif message[0] == 'cancelled':
+                self.cancelled.emit()
+            else:
+                print(message[2])
+                self.failed.emit(message[1])
+        elif not alive:
+            # Exited without reporting, e.g. crashed inside MuPDF
+            exitcode = self._process.exitcode
+            self._finish()
+            self.failed.emit(f"export process exited with code {exitcode}")
+
+    def _finish(self):
+        self._timer.stop()
+        self._process.join()
+        self._messages.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+        self._process = self._messages = self._cancel_event = self._temp_path = None
 
 
 # ==================== Control Panel ====================
@@ -789,6 +3118,7 @@ class ControlPanel(QFrame):
     scroll_requested = pyqtSignal(str)
     save_requested = pyqtSignal()
     save_all_requested = pyqtSignal()
+    cancel_export_requested = pyqtSignal()
     add_text_box_requested = pyqtSignal()
 
     def __init__(self, parent=None):
@@ -850,23 +3180,47 @@ class ControlPanel(QFrame):
         self.status_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.status_label, 1)
 
-        # Save button
-        self.save_button = QPushButton("💾 SAVE")
-        self.save_button.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-        """)
-        self.save_button.clicked.connect(self.save_all_requested.emit)
+        # Save button (cancels the export while one is running)
+        self.exporting = False
+        self.save_button = QPushButton()
+        self.save_button.clicked.connect(self.on_save_clicked)
         layout.addWidget(self.save_button)
+        self.set_exporting(False)
 
     def set_status(self, text):
         """Update status label."""
         self.status_label.setText(text)
 
+    def on_save_clicked(self):
+        if self.exporting:
+            self.cancel_export_requested.emit()
+        else:
+            self.save_all_requested.emit()
+
+    def set_exporting(self, active):
+        """Indicate a running export; the save button becomes cancel."""
+        self.exporting = active
+        if active:
+            self.save_button.setText("✖ CANCEL")
+            self.save_button.setStyleSheet("""
+                QPushButton {
+                    background-color: #e74c3c;
+                }
+                QPushButton:hover {
+                    background-color: #c0392b;
+                }
+            """)
+        else:
+            self.save_button.setText("💾 SAVE")
+            self.save_button.setStyleSheet("""
+                QPushButton {
+                    background-color: #27ae60;
+                }
+                QPushButton:hover {
+                    background-color: #229954;
+                }
+            """)
+
     def set_text_box_mode(self, active):
         """Indicate text box mode."""
         if active:
@@ -892,70 +3246,201 @@ class ControlPanel(QFrame):
 
 
 # ==================== Thumbnail Widget ====================
-class ThumbnailWidget(QListWidget):
-    """Page thumbnail navigation."""
+class ThumbnailModel(QAbstractListModel):
+    """Page list model that renders thumbnails on demand.
+
+    Only rows requested through request_rows() are rendered (on the render
+    worker pool); finished thumbnails are kept in a bounded LRU cache and
+    rows without one are painted as placeholders.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pdf_path = None
+        self.doc_key = None
+        self.page_count = 0
+        self.cache = PageRenderCache(THUMBNAIL_CACHE_BYTES)
+        self.render_pool = RenderWorkerPool.shared()
+        self.render_pool.page_rendered.connect(self._on_thumbnail_rendered)
+        self.render_pool.render_failed.connect(self._on_thumbnail_failed)
+
+    def set_document(self, pdf_path):
+        """Switch to a new document (no rendering happens here)."""
+        self.beginResetModel()
+        self.render_pool.cancel_except(self)
+        self.pdf_path = pdf_path
+        self.doc_key = DOCUMENT_POOL.document_key(pdf_path)
+        self.page_count = DOCUMENT_POOL.page_count(pdf_path)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.page_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        page_num = index.row()
+        if role == Qt.DisplayRole:
+            return f"P{page_num + 1}"
+        if role == Qt.UserRole:
+            return page_num
+        if role == Qt.DecorationRole:
+            return self.cache.get(self._key(page_num))
+        return None
+
+    def request_rows(self, first, last):
+        """Render thumbnails for rows first..last, cancelling other requests."""
+        if self.pdf_path is None:
+            return
+
+        wanted = []
+        for page_num in range(max(0, first), min(self.page_count - 1, last) + 1):
+            key = self._key(page_num)
+            if key not in self.cache:
+                wanted.append((key, page_num))
+
+        self.render_pool.cancel_except(self, [key for key, _ in wanted])
+        for key, page_num in wanted:
+            self.render_pool.submit(
+                self, key, self.pdf_path, page_num, THUMBNAIL_ZOOM,
+                disk_cache=DISK_RENDER_CACHE
+            )
+
+    def _key(self, page_num):
+        return PageRenderCache.make_key(self.doc_key, page_num, THUMBNAIL_ZOOM)
+
+    def _on_thumbnail_rendered(self, owner, key, image):
+        if owner is not self or key[0] != self.doc_key:
+            return
+
+        # Scale once here so painting never has to
+        pixmap = QPixmap.fromImage(image).scaled(
+            THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation
+        )
+        self.cache.put(key, pixmap)
+
+        index = self.index(key[1])
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _on_thumbnail_failed(self, owner, key, error):
+        # The placeholder stays; the row is requested again when scrolled into view
+        if owner is self:
+            print(f"Error rendering thumbnail of page {key[1] + 1}: {error}")
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paint a thumbnail (or placeholder) with its page label."""
+
+    ITEM_SIZE = QSize(100, 130)
+
+    def sizeHint(self, option, index):
+        return self.ITEM_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        selected = option.state & QStyle.State_Selected
+        if selected:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#3498db"))
+            painter.drawRoundedRect(rect, 3, 3)
+        elif option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#d5dbdb"))
+            painter.drawRoundedRect(rect, 3, 3)
+
+        # Thumbnail area
+        icon_rect = QRect(0, 0, THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height())
+        icon_rect.moveCenter(QPoint(rect.center().x(), rect.top() + 5 + icon_rect.height() // 2))
+
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            target = QRect(QPoint(0, 0), pixmap.size())
+            target.moveCenter(icon_rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            # Placeholder until the render lands
+            painter.setPen(QPen(QColor("#bdc3c7")))
+            painter.setBrush(Qt.white)
+            painter.drawRect(icon_rect.adjusted(10, 0, -10, 0))
+
+        # Page label
+        painter.setPen(Qt.white if selected else Qt.black)
+        text_rect = QRect(rect.left(), icon_rect.bottom() + 2, rect.width(), rect.bottom() - icon_rect.bottom() - 2)
+        painter.drawText(text_rect, Qt.AlignCenter, index.data(Qt.DisplayRole))
+
+        painter.restore()
+
+
+class ThumbnailWidget(QListView):
+    """Page thumbnail navigation (virtualized, rendered in the background)."""
 
     page_selected = pyqtSignal(int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setIconSize(QSize(80, 100))
+        self.thumbnail_model = ThumbnailModel(self)
+        self.setModel(self.thumbnail_model)
+        self.setItemDelegate(ThumbnailDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setIconSize(THUMBNAIL_SIZE)
         self.setMaximumWidth(120)
         self.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #ecf0f1;
                 border: none;
             }
-            QListWidget::item {
-                padding: 5px;
-                margin: 2px;
-                border-radius: 3px;
-            }
-            QListWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            QListWidget::item:hover {
-                background-color: #d5dbdb;
-            }
         """)
-        self.currentRowChanged.connect(self.on_item_changed)
-
-    def load_thumbnails(self, pdf_path):
-        """Generate page thumbnails."""
-        self.clear()
-        doc = fitz.open(pdf_path)
+        self.selectionModel().currentRowChanged.connect(self.on_item_changed)
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        # Render visible rows once scrolling settles
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(50)
+        self._visible_timer.timeout.connect(self.request_visible_thumbnails)
+        self.verticalScrollBar().valueChanged.connect(self._visible_timer.start)
 
-            # Render thumbnail
-            mat = fitz.Matrix(0.3, 0.3)
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
+    def load_thumbnails(self, pdf_path):
+        """Show page list; thumbnails are rendered as rows become visible."""
+        self.thumbnail_model.set_document(pdf_path)
+        self._visible_timer.start()
+
+    def request_visible_thumbnails(self):
+        """Render rows in (and near) the viewport."""
+        rows = self.thumbnail_model.rowCount()
+        if rows == 0:
+            return
 
-            # Create QPixmap
-            pixmap = QPixmap()
-            pixmap.loadFromData(img_data)
+        first = self.indexAt(QPoint(5, 5)).row()
+        last = self.indexAt(QPoint(5, self.viewport().height() - 5)).row()
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = rows - 1
 
-            # Create list item
-            item = QListWidgetItem(f"P{page_num + 1}")
-            item.setIcon(QIcon(pixmap))
-            item.setData(Qt.UserRole, page_num)
-            self.addItem(item)
+        self.thumbnail_model.request_rows(
+            first - THUMBNAIL_PREFETCH_ROWS, last + THUMBNAIL_PREFETCH_ROWS
+        )
 
-        doc.close()
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._visible_timer.start()
 
-    def on_item_changed(self, row):
+    def on_item_changed(self, current, previous=None):
         """Handle thumbnail selection."""
-        if row >= 0:
-            item = self.item(row)
-            page_num = item.data(Qt.UserRole)
+        if current.isValid():
+            page_num = current.data(Qt.UserRole)
             self.page_selected.emit(page_num)
 
     def set_current_page(self, page_num):
         """Set current page highlight."""
-        self.setCurrentRow(page_num)
+        self.setCurrentIndex(self.thumbnail_model.index(page_num))
 
 
 # ==================== Main Window ====================
@@ -985,6 +3470,11 @@ class MainWindow(QMainWindow):
         self.total_pages = 1
         self.signature_scale = 0.3
         self.current_pdf_path = PDF_PATH
+        self.document_id = DEFAULT_DOCUMENT_ID
+        self.annotations = AnnotationModel(parent=self)
+        self.export_worker = ExportWorker(self)
+        self.export_messages = None  # (done status, done text, error text) of the export
+        self.export_started = None
 
         self.init_ui()
         self.load_pdf()
@@ -1031,6 +3521,10 @@ class MainWindow(QMainWindow):
         save_text_action.triggered.connect(self.save_text_boxes_to_pdf)
         toolbar.addAction(save_text_action)
 
+        import_text_action = QAction("📥 Import Text Boxes", self)
+        import_text_action.triggered.connect(self.import_text_boxes)
+        toolbar.addAction(import_text_action)
+
         toolbar.addSeparator()
 
         # Create splitter for main content
@@ -1045,6 +3539,11 @@ class MainWindow(QMainWindow):
         self.pdf_viewer = PDFScrollArea()
         self.pdf_viewer.page_changed.connect(self.on_page_changed)
         self.pdf_viewer.text_boxes_changed.connect(self.on_text_boxes_changed)
+        # Edits reach the annotation model (and autosave) right away
+        self.pdf_viewer.text_boxes_edited.connect(self.save_text_boxes_state)
+        self.pdf_viewer.render_failed.connect(
+            lambda error: self.status_bar.showMessage(error, 5000)
+        )
         splitter.addWidget(self.pdf_viewer)
 
         # Set splitter sizes
@@ -1059,6 +3558,7 @@ class MainWindow(QMainWindow):
         self.control_panel.scroll_requested.connect(self.on_scroll_request)
         self.control_panel.save_requested.connect(self.save_state)
         self.control_panel.save_all_requested.connect(self.save_signed_pdf)
+        self.control_panel.cancel_export_requested.connect(self.export_worker.cancel)
         self.control_panel.add_text_box_requested.connect(self.toggle_text_box_mode)
         main_layout.addWidget(self.control_panel)
 
@@ -1067,6 +3567,26 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.update_status_bar()
 
+        # Latency summary while profiling (PDF_EDITOR_PROFILE)
+        if INSTRUMENTATION.enabled:
+            self.profile_label = QLabel()
+            self.status_bar.addPermanentWidget(self.profile_label)
+            self.profile_timer = QTimer(self)
+            self.profile_timer.timeout.connect(self.update_profile_summary)
+            self.profile_timer.start(1000)
+
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.cancelled.connect(self.on_export_cancelled)
+
+        self.annotations.saved.connect(
+            lambda pages: self.status_bar.showMessage("Text boxes saved", 2000)
+        )
+        self.annotations.save_failed.connect(
+            lambda error: self.status_bar.showMessage(f"Failed to save text boxes: {error}", 5000)
+        )
+
     def load_pdf(self):
         """Load the PDF file."""
         self.load_pdf_with_path(self.current_pdf_path)
@@ -1077,9 +3597,14 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"PDF not found:\n{pdf_path}")
             return
 
-        # Get total pages
-        reader = PdfReader(pdf_path)
-        self.total_pages = len(reader.pages)
+        # Get total pages (document stays open in the pool for rendering)
+        self.total_pages = DOCUMENT_POOL.page_count(pdf_path)
+
+        # Annotations and UI state are kept per document content
+        self.document_id = DOCUMENT_POOL.fingerprint(pdf_path)
+        if os.path.abspath(pdf_path) == os.path.abspath(PDF_PATH):
+            SettingsManager.migrate_legacy(self.document_id)
+        self.annotations.load(self.document_id)
 
         # Show last page (P7) by default - signature only appears here
         self.current_page = self.total_pages - 1
@@ -1094,8 +3619,7 @@ class MainWindow(QMainWindow):
         if self.current_page == self.total_pages - 1 and os.path.exists(SIGN_PNG):
             self.pdf_viewer.add_signature(SIGN_PNG, scale=self.signature_scale)
 
-        # Restore text boxes
-        self.restore_text_boxes()
+        # Text boxes are restored by on_page_changed
 
         # Update thumbnails selection
         self.thumbnails.set_current_page(self.current_page)
@@ -1109,6 +3633,11 @@ class MainWindow(QMainWindow):
             "PDF Files (*.pdf)"
         )
         if file_path:
+            # Keep the current document's edits before switching
+            try:
+                self.save_text_boxes_state()
+            except Exception:
+                pass
             self.current_pdf_path = file_path
             self.load_pdf_with_path(file_path)
 
@@ -1139,8 +3668,8 @@ class MainWindow(QMainWindow):
             except Exception:
                 self.pdf_viewer.signature_item = None  # Reset if invalid
 
-        # Restore text boxes for this page after delay
-        QTimer.singleShot(100, self.restore_text_boxes)
+        # Restore text boxes for this page
+        self.restore_text_boxes()
 
         # Update status bar
         try:
@@ -1175,131 +3704,65 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("", 1000)
 
     def save_text_boxes_state(self):
-        """Save text boxes state to file."""
-        text_boxes = self.pdf_viewer.get_text_boxes()
-
-        # Get display and PDF dimensions for coordinate conversion
-        display_pixmap = self.pdf_viewer.pixmap
-        if display_pixmap:
-            display_width = display_pixmap.width()
-            display_height = display_pixmap.height()
-            pdf_w = self.pdf_viewer.pdf_width
-            pdf_h = self.pdf_viewer.pdf_height
-        else:
-            display_width = display_height = pdf_w = pdf_h = None
-
-        # Convert text boxes to dict with coordinate conversion
-        text_boxes_dicts = []
-        for tb in text_boxes:
-            tb_dict = tb.to_dict(pdf_w, pdf_h, display_width, display_height)
-            text_boxes_dicts.append(tb_dict)
-
-        SettingsManager.save_text_boxes_from_dicts(text_boxes_dicts, self.current_page)
-        self.status_bar.showMessage("Text boxes saved", 2000)
+        """Store the current page's text boxes in the annotation model."""
+        # Scene coordinates are already PDF points
+        text_boxes_dicts = [tb.to_dict() for tb in self.pdf_viewer.get_text_boxes()]
+        self.annotations.set_page(self.current_page, text_boxes_dicts)
 
     def save_text_boxes_to_pdf(self):
         """Save only text boxes to PDF (all pages)."""
-        self.control_panel.set_status("⏳ Saving text boxes...")
-
-        try:
-            reader = PdfReader(self.current_pdf_path)
-            writer = PdfWriter()
-
-            # Save current page's text boxes first
-            self.save_text_boxes_state()
-
-            # Load all text boxes from file
-            all_text_boxes = SettingsManager.load_text_boxes(page_num=None)
-            if not all_text_boxes:
-                all_text_boxes = {}
-
-            for i, page in enumerate(reader.pages):
-                has_content = False
-                packet = io.BytesIO()
-                page_obj = reader.pages[i]
-                page_width = float(page_obj.mediabox[2])
-                page_height = float(page_obj.mediabox[3])
-
-                c = canvas.Canvas(packet, pagesize=(page_width, page_height))
-
-                # Get text boxes for this page
-                page_key = str(i)
-                if page_key not in all_text_boxes:
-                    writer.add_page(page)
-                    continue
-
-                page_text_boxes = all_text_boxes[page_key].get('text_boxes', [])
-
-                # Add text boxes for this page (x, y are already in PDF coordinates)
-                for tb_dict in page_text_boxes:
-                    try:
-                        tb_text = tb_dict.get('text', '')
-                        tb_font_family = tb_dict.get('font_family', 'Helvetica')
-                        tb_font_size = tb_dict.get('font_size', 12)
-                        tb_pos_x = tb_dict.get('x', 0)
-                        tb_pos_y = tb_dict.get('y', 0)
-
-                        # Calculate final Y (reportlab coordinates from bottom)
-                        final_y = page_height - tb_pos_y - tb_font_size
-
-                        # Set font (fallback to Helvetica if font not found)
-                        try:
-                            c.setFont(tb_font_family, tb_font_size)
-                        except:
-                            c.setFont('Helvetica', tb_font_size)
-
-                        c.setFillColorRGB(0, 0, 0)
-
-                        # Draw text
-                        c.drawString(tb_pos_x, final_y, tb_text)
-                        has_content = True
-                    except Exception as e:
-                        print(f"Error adding text box: {e}")
-
-                # Only save canvas if there's content
-                if has_content:
-                    c.save()
-                    packet.seek(0)
-
-                    watermark = PdfReader(packet)
-                    if len(watermark.pages) > 0:
-                        watermark_page = watermark.pages[0]
-                        page_obj.merge_page(watermark_page)
+        self.export_pdf(
+            signature=False, done_status="✓ Text Boxes Saved!",
+            done_message=f"Text boxes saved to PDF:\n{OUTPUT_PATH}",
+            error_message="Failed to save text boxes"
+        )
 
-                writer.add_page(page)
+    def restore_text_boxes(self):
+        """Show the current page's text boxes from the annotation model."""
+        text_boxes = self.annotations.page(self.current_page)
+        if not text_boxes:
+            return
 
-            with open(OUTPUT_PATH, "wb") as output_file:
-                writer.write(output_file)
+        self.pdf_viewer.view.add_text_box_items([
+            PDFTextBoxItem.from_dict(tb_data) for tb_data in text_boxes
+        ])
 
-            self.control_panel.set_status("✓ Text Boxes Saved!")
-            QMessageBox.information(self, "Success", f"Text boxes saved to PDF:\n{OUTPUT_PATH}")
+    def import_text_boxes(self):
+        """Import text boxes from a CSV or JSON file into this document."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Text Boxes", os.path.dirname(self.current_pdf_path),
+            "Text Boxes (*.csv *.json)"
+        )
+        if not file_path:
+            return
 
+        try:
+            fields = read_text_box_fields(file_path)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save text boxes:\n{str(e)}")
-            self.control_panel.set_status("✗ Save Failed")
-            import traceback
-            traceback.print_exc()
-
-    def restore_text_boxes(self):
-        """Restore text boxes from file for current page."""
-        data = SettingsManager.load_text_boxes(self.current_page)
-        if not data:
+            QMessageBox.warning(self, "Import Failed", f"Could not read text boxes:\n{str(e)}")
             return
 
-        # Get display and PDF dimensions for coordinate conversion
-        display_pixmap = self.pdf_viewer.pixmap
-        if display_pixmap:
-            display_width = display_pixmap.width()
-            display_height = display_pixmap.height()
-            pdf_w = self.pdf_viewer.pdf_width
-            pdf_h = self.pdf_viewer.pdf_height
-        else:
-            display_width = display_height = pdf_w = pdf_h = None
-
-        for tb_data in data.get('text_boxes', []):
-            text_box = PDFTextBoxItem.from_dict(tb_data, display_width, display_height, pdf_w, pdf_h)
-            self.pdf_viewer.view.scene.addItem(text_box)
-            self.pdf_viewer.view.text_boxes.append(text_box)
+        # Keep edits on the current page, then merge the imported boxes
+        self.save_text_boxes_state()
+        imported = skipped = 0
+        for page_num, text_boxes in fields.items():
+            if not 0 <= page_num < self.total_pages:
+                skipped += len(text_boxes)
+                continue
+            self.annotations.set_page(page_num, self.annotations.page(page_num) + text_boxes)
+            imported += len(text_boxes)
+
+        # Only the current page is in the scene; others load on navigation
+        current = fields.get(self.current_page, [])
+        if current:
+            self.pdf_viewer.view.add_text_box_items([
+                PDFTextBoxItem.from_dict(tb_data) for tb_data in current
+            ])
+
+        message = f"Imported {imported} text boxes"
+        if skipped:
+            message += f" ({skipped} on pages outside this document skipped)"
+        self.status_bar.showMessage(message, 5000)
 
     def save_state(self):
         """Save current UI state."""
@@ -1308,19 +3771,20 @@ class MainWindow(QMainWindow):
 
         success, message = SettingsManager.save_state(
             scroll_pos, signature_pos, self.signature_scale,
-            self.current_page, self.total_pages
+            self.current_page, self.total_pages, self.document_id
         )
 
         if success:
             self.control_panel.set_status("✓ Saved")
             self.save_text_boxes_state()  # Also save text boxes
+            self.annotations.flush()
             self.status_bar.showMessage(f"State saved: {message}", 3000)
         else:
             QMessageBox.warning(self, "Save Failed", message)
 
     def restore_state(self):
         """Restore previous UI state."""
-        state = SettingsManager.load_state()
+        state = SettingsManager.load_state(self.document_id)
         if not state:
             return
 
@@ -1335,7 +3799,7 @@ class MainWindow(QMainWindow):
             pos = state['signature_position']
             QTimer.singleShot(100, lambda: self.pdf_viewer.add_signature(
                 SIGN_PNG,
-                QPoint(pos['x'], pos['y']),
+                QPointF(pos['x'], pos['y']),
                 self.signature_scale
             ))
 
@@ -1347,139 +3811,102 @@ class MainWindow(QMainWindow):
 
     def save_signed_pdf(self):
         """Save the signed PDF with text boxes."""
-        self.control_panel.set_status("⏳ Saving...")
+        self.export_pdf(
+            signature=True, done_status="✓ PDF Saved!",
+            done_message=f"Signed PDF saved to:\n{OUTPUT_PATH}",
+            error_message="Failed to save PDF"
+        )
 
-        try:
-            reader = PdfReader(self.current_pdf_path)
-            writer = PdfWriter()
+    def export_pdf(self, signature, done_status, done_message, error_message):
+        """Export text boxes (and the signature) to OUTPUT_PATH in the background.
+
+        The window stays usable while the export runs; see ExportWorker.
+        """
+        if self.export_worker.is_running():
+            return
 
+        try:
             # Save current page's text boxes first
             self.save_text_boxes_state()
 
-            # Load all text boxes from file
-            all_text_boxes = SettingsManager.load_text_boxes(page_num=None)
-            if not all_text_boxes:
-                all_text_boxes = {}
-
-            # Get display pixmap for coordinate conversion (for signature)
-            display_pixmap = self.pdf_viewer.pixmap
-            if display_pixmap:
-                display_width = display_pixmap.width()
-                display_height = display_pixmap.height()
-                pdf_w = self.pdf_viewer.pdf_width
-                pdf_h = self.pdf_viewer.pdf_height
-            else:
-                display_width = display_height = pdf_w = pdf_h = None
-
-            for i, page in enumerate(reader.pages):
-                has_content = False
-                packet = io.BytesIO()
-                page_obj = reader.pages[i]
-                page_width = float(page_obj.mediabox[2])
-                page_height = float(page_obj.mediabox[3])
-
-                c = canvas.Canvas(packet, pagesize=(page_width, page_height))
-
-                # Get text boxes for this page
-                page_key = str(i)
-                if page_key in all_text_boxes:
-                    page_text_boxes = all_text_boxes[page_key].get('text_boxes', [])
-
-                    # Add text boxes for this page (x, y are already in PDF coordinates)
-                    for tb_dict in page_text_boxes:
-                        try:
-                            tb_text = tb_dict.get('text', '')
-                            tb_font_family = tb_dict.get('font_family', 'Helvetica')
-                            tb_font_size = tb_dict.get('font_size', 12)
-                            tb_pos_x = tb_dict.get('x', 0)
-                            tb_pos_y = tb_dict.get('y', 0)
-
-                            # Calculate final Y (reportlab coordinates from bottom)
-                            final_y = page_height - tb_pos_y - tb_font_size
-
-                            # Set font (fallback to Helvetica if font not found)
-                            try:
-                                c.setFont(tb_font_family, tb_font_size)
-                            except:
-                                c.setFont('Helvetica', tb_font_size)
-
-                            c.setFillColorRGB(0, 0, 0)
-
-                            # Draw text
-                            c.drawString(tb_pos_x, final_y, tb_text)
-                            has_content = True
-                        except Exception as e:
-                            print(f"Error adding text box: {e}")
-
-                # Add signature if on current page (last page P7)
-                if i == self.total_pages - 1 and self.pdf_viewer.signature_item:
-                    try:
-                        sig_item = self.pdf_viewer.signature_item
-                        scene_pos = sig_item.pos()
-
-                        sig_pixmap = sig_item.pixmap()
-                        orig_pixmap = QPixmap(SIGN_PNG)
-                        scale = sig_pixmap.width() / orig_pixmap.width()
-
-                        img_reader = ImageReader(SIGN_PNG)
-                        img_width, img_height = img_reader.getSize()
-
-                        sig_width = img_width * scale
-                        sig_height = img_height * scale
-
-                        pdf_x = scene_pos.x() * (pdf_w / display_width)
-                        pdf_y = scene_pos.y() * (pdf_h / display_height)
-
-                        final_y = page_height - pdf_y - sig_height
-
-                        c.drawImage(
-                            SIGN_PNG,
-                            pdf_x,
-                            final_y,
-                            sig_width,
-                            sig_height,
-                            preserveAspectRatio=True,
-                            mask='auto'
-                        )
-                        has_content = True
-                    except Exception as e:
-                        print(f"Error adding signature: {e}")
+            exporter = self.build_exporter(signature)
+            DOCUMENT_POOL.close(exporter.output_path)
+            self.export_messages = (done_status, done_message, error_message)
+            self.export_started = time.perf_counter()
+            self.export_worker.start(exporter)
+            self.control_panel.set_exporting(True)
+            self.on_export_progress(0, 1)
 
-                # Only save canvas if there's content
-                if has_content:
-                    c.save()
-                    packet.seek(0)
-
-                    watermark = PdfReader(packet)
-                    if len(watermark.pages) > 0:
-                        watermark_page = watermark.pages[0]
-                        page_obj.merge_page(watermark_page)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{error_message}:\n{str(e)}")
+            self.control_panel.set_status("✗ Save Failed")
+            traceback.print_exc()
 
-                writer.add_page(page)
+    def build_exporter(self, signature=True):
+        """Export pipeline for the open document.
 
-            with open(OUTPUT_PATH, "wb") as output_file:
-                writer.write(output_file)
+        Stages: the text boxes of all pages, then the signature on the
+        last page when signature is set and one is placed.
+        """
+        # x, y are already in PDF coordinates
+        exporter = PDFExporter(self.current_pdf_path, OUTPUT_PATH)
+        exporter.add_stage(TextBoxStage(self.annotations.pages()))
 
-            self.control_panel.set_status("✓ PDF Saved!")
-            QMessageBox.information(self, "Success", f"Signed PDF saved to:\n{OUTPUT_PATH}")
+        if signature and self.pdf_viewer.signature_item:
+            try:
+                exporter.add_stage(self.signature_stage())
+            except Exception as e:
+                print(f"Error adding signature: {e}")
+        return exporter
+
+    def signature_stage(self):
+        """Export stage placing the signature at its position on the last page."""
+        # Scene coordinates are PDF points
+        rect = self.pdf_viewer.signature_item.sceneBoundingRect()
+
+        stage = ImageStage("signature")
+        stage.add(
+            self.total_pages - 1, SIGN_PNG,
+            rect.x(), rect.y(), rect.width(), rect.height(),
+            stream=SIGNATURE_ASSETS.stream(SIGN_PNG)
+        )
+        return stage
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save PDF:\n{str(e)}")
-            self.control_panel.set_status("✗ Save Failed")
-            import traceback
-            traceback.print_exc()
+    def on_export_progress(self, done, total):
+        if done < total:
+            self.control_panel.set_status(f"⏳ Saving... {done * 100 // total}%")
+        else:
+            self.control_panel.set_status("⏳ Writing file...")
+
+    def on_export_finished(self, pages, timings):
+        # Timed here: the export process's own timers stay in that process
+        record_export_timings(timings, time.perf_counter() - self.export_started)
+        self.control_panel.set_exporting(False)
+        done_status, done_message, _ = self.export_messages
+        self.control_panel.set_status(done_status)
+        self.status_bar.showMessage(f"Exported {pages} pages: {format_timings(timings)}", 10000)
+        QMessageBox.information(self, "Success", done_message)
+
+    def on_export_failed(self, error):
+        self.control_panel.set_exporting(False)
+        self.control_panel.set_status("✗ Save Failed")
+        QMessageBox.critical(self, "Error", f"{self.export_messages[2]}:\n{error}")
+
+    def on_export_cancelled(self):
+        self.control_panel.set_exporting(False)
+        self.control_panel.set_status("✗ Save Cancelled")
 
     def update_status_bar(self):
         """Update status bar."""
         try:
-            text_boxes = self.pdf_viewer.get_text_boxes()
+            text_box_count = self.pdf_viewer.text_box_count()
             sig_pos = self.pdf_viewer.get_signature_position()
 
-            pos_str = f"({sig_pos.x()}, {sig_pos.y()})" if sig_pos else "N/A"
+            pos_str = f"({sig_pos.x():.0f}, {sig_pos.y():.0f})" if sig_pos else "N/A"
             self.status_bar.showMessage(
                 f"Page {self.current_page + 1} / {self.total_pages} | "
                 f"Signature: {pos_str} | "
-                f"Text Boxes: {len(text_boxes)}"
+                f"Text Boxes: {text_box_count}"
             )
         except Exception as e:
             # Fallback if there's any error
@@ -1487,10 +3914,23 @@ class MainWindow(QMainWindow):
                 f"Page {self.current_page + 1} / {self.total_pages}"
             )
 
+    def update_profile_summary(self):
+        """Show page switch and export latency percentiles."""
+        self.profile_label.setText(INSTRUMENTATION.summary(("page.switch", "export.total")))
+
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts."""
-        if event.key() == Qt.Key_S and event.modifiers() & Qt.ControlModifier:
+        ctrl = event.modifiers() & Qt.ControlModifier
+        if event.key() == Qt.Key_S and ctrl:
             self.save_signed_pdf()
+        elif event.key() in (Qt.Key_Plus, Qt.Key_Equal) and ctrl:
+            self.pdf_viewer.view.zoom_in()
+        elif event.key() == Qt.Key_Minus and ctrl:
+            self.pdf_viewer.view.zoom_out()
+        elif event.key() == Qt.Key_0 and ctrl:
+            self.pdf_viewer.view.set_zoom(1.0)
+        elif event.key() == Qt.Key_Escape and self.export_worker.is_running():
+            self.export_worker.cancel()
         elif event.key() == Qt.Key_Up:
             self.on_scroll_request('up')
         elif event.key() == Qt.Key_Down:
@@ -1498,9 +3938,645 @@ class MainWindow(QMainWindow):
         else:
             super().keyPressEvent(event)
 
+    def closeEvent(self, event):
+        """Write pending edits and release documents and workers on exit."""
+        self.export_worker.shutdown()
+        try:
+            self.save_text_boxes_state()
+        except Exception:
+            pass
+        self.annotations.close()
+        ANNOTATION_STORE.close()
+        RenderWorkerPool.shared().shutdown()
+        DOCUMENT_POOL.close_all()
+        DISK_RENDER_CACHE.trim()
+        report = INSTRUMENTATION.write_report()
+        if report:
+            print(f"INFO Profile written to {report}")
+        super().closeEvent(event)
+
+
+# ==================== Batch Signing ====================
+BATCH_WORKERS = os.cpu_count() or 1
+
+
+def batch_resolve_path(path, base_dir):
+    """Resolve a manifest path relative to the manifest's directory."""
+    path = os.path.expanduser(path)
+    if os.path.isabs(path):
+        return path
+    return os.path.join(base_dir, path)
+
+
+def load_batch_manifest(manifest_path):
+    """Read a batch manifest and return a list of self-contained jobs.
+
+    Manifest format (JSON); coordinates are PDF points from the top-left:
+        {
+          "output_dir": "signed",            # optional
+          "defaults": {...},                 # optional, merged into each job
+          "jobs": [
+            {
+              "input": "a.pdf",
+              "output": "a_signed.pdf",      # optional
+              "text_boxes": "text_boxes.json", "fields.csv" or
+                            {page: {"text_boxes": [...]}},
+              "signatures": [
+                {"image": "Sign.png", "page": -1, "x": 400, "y": 700,
+                 "width": 120}                # height/width optional
+              ]
+            }
+          ]
+        }
+    A page of -1 means the last page. Relative paths are resolved against
+    the manifest's directory.
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    defaults = manifest.get('defaults', {})
+    output_dir = manifest.get('output_dir')
+    if output_dir:
+        output_dir = batch_resolve_path(output_dir, base_dir)
+
+    jobs = []
+    for index, entry in enumerate(manifest.get('jobs', [])):
+        job = dict(defaults)
+        job.update(entry)
+        job['index'] = index
+
+        if job.get('input'):
+            job['input'] = batch_resolve_path(job['input'], base_dir)
+            if job.get('output'):
+                job['output'] = batch_resolve_path(job['output'], output_dir or base_dir)
+            else:
+                stem = os.path.splitext(os.path.basename(job['input']))[0]
+                job['output'] = os.path.join(
+                    output_dir or os.path.dirname(job['input']), f"{stem}_signed.pdf"
+                )
+
+        if isinstance(job.get('text_boxes'), str):
+            job['text_boxes'] = batch_resolve_path(job['text_boxes'], base_dir)
+        job['signatures'] = [
+            dict(sig, image=batch_resolve_path(sig['image'], base_dir))
+            if sig.get('image') else dict(sig)
+            for sig in job.get('signatures', [])
+        ]
+        jobs.append(job)
+    return jobs
+
+
+def sign_document(job, full_rewrite=False, backend=None):
+    """Apply one manifest job; runs in a worker process without Qt.
+
+    Never raises: failures are returned in the result so one bad file
+    doesn't stop the batch. Source documents and signature images are
+    cached per worker process (DOCUMENT_POOL, SIGNATURE_ASSETS).
+    """
+    start = time.perf_counter()
+    result = {
+        'index': job.get('index'),
+        'input': job.get('input'),
+        'output': job.get('output'),
+        'ok': False,
+        'pages': 0,
+        'error': None
+    }
+    try:
+        if not job.get('input'):
+            raise ValueError("job has no 'input'")
+        if os.path.abspath(job['input']) == os.path.abspath(job['output']):
+            raise ValueError("output would overwrite input")
+
+        page_count = DOCUMENT_POOL.page_count(job['input'])
+        exporter = PDFExporter(job['input'], job['output'],
+                               full_rewrite=full_rewrite, backend=backend)
+
+        text_boxes = job.get('text_boxes') or {}
+        if isinstance(text_boxes, str):
+            text_boxes = read_text_box_fields(text_boxes)
+        else:
+            text_boxes = text_box_fields_from_data(text_boxes)
+        exporter.add_stage(TextBoxStage(text_boxes))
+        signatures = exporter.add_stage(ImageStage("signature"))
+
+        for sig in job['signatures']:
+            page_num = int(sig.get('page', -1))
+            if page_num < 0:
+                page_num += page_count
+            if not 0 <= page_num < page_count:
+                raise ValueError(f"signature page {sig.get('page')} out of range")
+
+            img_width, img_height = SIGNATURE_ASSETS.image_size(sig['image'])
+            width, height = sig.get('width'), sig.get('height')
+            if width is None and height is None:
+                scale = sig.get('scale', 1.0)
+                width, height = img_width * scale, img_height * scale
+            elif width is None:
+                width = height * img_width / img_height
+            elif height is None:
+                height = width * img_height / img_width
+
+            signatures.add(
+                page_num, sig['image'], sig.get('x', 0), sig.get('y', 0), width, height,
+                stream=SIGNATURE_ASSETS.stream(sig['image'])
+            )
+
+        output_dir = os.path.dirname(job['output'])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        result['pages'] = exporter.export()
+        result['timings'] = dict(exporter.timings)
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs, workers=None, full_rewrite=False, backend=None, progress=None):
+    """Sign jobs across a process pool; return results in manifest order.
+
+    progress(done, total, result) is called as each job finishes.
+    """
+    workers = max(1, min(workers or BATCH_WORKERS, len(jobs) or 1))
+    results = [None] * len(jobs)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(sign_document, job, full_rewrite, backend): position
+            for position, job in enumerate(jobs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            position = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker died (e.g. crashed inside MuPDF)
+                job = jobs[position]
+                result = {
+                    'index': job.get('index'), 'input': job.get('input'),
+                    'output': job.get('output'), 'ok': False, 'pages': 0,
+                    'error': f"{type(e).__name__}: {e}", 'seconds': 0.0
+                }
+            if result['ok']:
+                record_export_timings(result['timings'], result['seconds'])
+            results[position] = result
+            if progress:
+                progress(done, len(jobs), result)
+    return results
+
+
+def batch_main(argv):
+    """Command line entry point for headless batch signing."""
+    parser = argparse.ArgumentParser(
+        prog="pdf_editor_with_textboxes.py batch",
+        description="Sign PDFs listed in a JSON manifest without the GUI."
+    )
+    parser.add_argument("manifest", help="JSON manifest of jobs")
+    parser.add_argument("-j", "--workers", type=int, default=BATCH_WORKERS,
+                        help=f"worker processes (default {BATCH_WORKERS})")
+    parser.add_argument("--backend", choices=sorted(OVERLAY_BACKENDS), default=None,
+                        help=f"overlay backend (default {OVERLAY_BACKEND})")
+    parser.add_argument("--full-rewrite", action="store_true",
+                        help="rewrite whole documents instead of incremental saves")
+    parser.add_argument("--report", help="write per-file results to this JSON file")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only report failures")
+    args = parser.parse_args(argv)
+
+    jobs = load_batch_manifest(args.manifest)
+
+    def progress(done, total, result):
+        if result['ok']:
+            if not args.quiet:
+                print(f"[{done}/{total}] ok   {result['input']} -> {result['output']} "
+                      f"({result['seconds'] * 1000:.0f} ms)", flush=True)
+        else:
+            print(f"[{done}/{total}] FAIL {result['input']}: {result['error']}",
+                  file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    results = run_batch(jobs, workers=args.workers, full_rewrite=args.full_rewrite,
+                        backend=args.backend, progress=progress)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r['ok']]
+    rate = len(results) / elapsed if elapsed else 0.0
+    print(f"Signed {len(results) - len(failed)}/{len(results)} files in {elapsed:.1f}s "
+          f"({rate:.1f} files/s, {len(failed)} failed)")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    return 1 if failed else 0
+
+
+def fill_text_boxes(source_path, fields_path, output_path, full_rewrite=False, backend=None):
+    """Write text boxes from a CSV/JSON file into a copy of a PDF.
+
+    Headless counterpart of MainWindow.import_text_boxes: goes straight to
+    PDFExporter without building scene items. Returns (boxes, pages).
+    """
+    fields = read_text_box_fields(fields_path)
+    page_count = DOCUMENT_POOL.page_count(source_path)
+    exporter = PDFExporter(source_path, output_path, full_rewrite=full_rewrite, backend=backend)
+    boxes = 0
+    for page_num, text_boxes in fields.items():
+        if page_num >= page_count:
+            print(f"Skipping {len(text_boxes)} text boxes on page {page_num + 1}: "
+                  f"document has {page_count} pages", file=sys.stderr)
+            continue
+        exporter.add_text_boxes(page_num, text_boxes)
+        boxes += len(text_boxes)
+    return boxes, exporter.export()
+
+
+def fill_main(argv):
+    """Command line entry point: fill text boxes from a file into a PDF."""
+    parser = argparse.ArgumentParser(
+        prog="pdf_editor_with_textboxes.py fill",
+        description="Write text boxes from a CSV or JSON file into a copy of a PDF."
+    )
+    parser.add_argument("source", help="PDF to fill")
+    parser.add_argument("fields", help=".csv (page,x,y,text,...) or .json text boxes")
+    parser.add_argument("-o", "--output", required=True, help="output PDF")
+    parser.add_argument("--backend", choices=sorted(OVERLAY_BACKENDS), default=None,
+                        help=f"overlay backend (default {OVERLAY_BACKEND})")
+    parser.add_argument("--full-rewrite", action="store_true",
+                        help="rewrite the whole document instead of an incremental save")
+    args = parser.parse_args(argv)
+
+    try:
+        boxes, pages = fill_text_boxes(args.source, args.fields, args.output,
+                                       args.full_rewrite, args.backend)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {boxes} text boxes on {pages} pages to {args.output}")
+    return 0
+
+
+def import_main(argv):
+    """Command line entry point: import text_boxes.json files into the store."""
+    parser = argparse.ArgumentParser(
+        prog="pdf_editor_with_textboxes.py import",
+        description="Import text_boxes.json files into the annotation database."
+    )
+    parser.add_argument("json_files", nargs="+", help="text_boxes.json files")
+    parser.add_argument("--pdf", help="PDF the text boxes belong to; they are imported "
+                                      "into its annotation set (its fingerprint)")
+    parser.add_argument("--document-id", default=None,
+                        help="annotation set to import into (default: the --pdf "
+                             f"fingerprint, else {DEFAULT_DOCUMENT_ID!r}, which the editor "
+                             "moves to PDF_PATH when it opens it)")
+    parser.add_argument("--db", default=ANNOTATION_DB, help="annotation database path")
+    args = parser.parse_args(argv)
+
+    document_id = args.document_id
+    if document_id is None:
+        if args.pdf:
+            if not os.path.isfile(args.pdf):
+                parser.error(f"no such PDF: {args.pdf}")
+            # The id the editor uses for this PDF (see load_pdf_with_path)
+            document_id = DOCUMENT_POOL.fingerprint(args.pdf)
+        else:
+            document_id = DEFAULT_DOCUMENT_ID
+
+    store = AnnotationStore(args.db)
+    try:
+        for json_path in args.json_files:
+            pages = store.import_json(json_path, document_id)
+            print(f"Imported {pages} pages from {json_path} into {document_id}")
+    finally:
+        store.close()
+    return 0
+
+
+# ==================== Mail Merge ====================
+MERGE_PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")  # {{ column }}
+MERGE_CHUNK_ROWS = 16                    # Rows per task sent to a merge worker
+MERGE_UNSAFE_CHARS = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+
+
+def merge_placeholders(text):
+    """Column names referenced by {{name}} placeholders in text."""
+    return set(MERGE_PLACEHOLDER.findall(text or ''))
+
+
+def merge_substitute(text, row):
+    """Replace {{name}} placeholders with values from row."""
+    def value(match):
+        name = match.group(1)
+        if name not in row:
+            raise ValueError(f"no value for {{{{{name}}}}}")
+        return '' if row[name] is None else str(row[name])
+    return MERGE_PLACEHOLDER.sub(value, text)
+
+
+def read_merge_rows(path):
+    """Read merge data: a .csv with a header row, or a JSON list of objects."""
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            return list(csv.DictReader(f))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"{path}: expected a JSON list of objects")
+    return rows
+
+
+def merge_output_names(pattern, rows, output_dir):
+    """Output paths for rows from a pattern like "{{name}}.pdf".
+
+    {{_row}} is the 1-based row number. Values are made safe for file
+    names, and repeated names get the row number appended.
+    """
+    width = len(str(len(rows)))
+    paths, seen = [], set()
+    for index, row in enumerate(rows, 1):
+        values = dict(row, _row=str(index).zfill(width))
+        name = MERGE_UNSAFE_CHARS.sub('_', merge_substitute(pattern, values)).strip(' .')
+        stem, ext = os.path.splitext(name or values['_row'])
+        name = stem + (ext or '.pdf')
+        if name in seen:
+            name = f"{stem}_{values['_row']}{ext or '.pdf'}"
+        seen.add(name)
+        paths.append(os.path.join(output_dir, name))
+    return paths
+
+
+class MergeTemplate:
+    """A source PDF and text box layout prepared once for many outputs.
+
+    The source is parsed once: text boxes without placeholders are drawn
+    into it, and each page with placeholder boxes gets its content
+    wrapped, fonts registered and an empty overlay stream reserved. All
+    of that is one incremental update kept in memory (prepared). render()
+    writes a copy of those bytes and only fills the reserved streams, so
+    per-row cost depends on the placeholder boxes, not on page content.
+
+    Instances are plain data and are pickled once to each merge worker.
+    """
+
+    def __init__(self, source_path, text_boxes):
+        self.source_path = source_path
+        self.fields = set()
+        self._slots = {}  # page_num -> (overlay stream xref, placeholder text boxes)
+
+        fd, work_path = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, work_path)
+            doc = fitz.open(work_path)
+            try:
+                self._prepare(doc, text_boxes)
+                if doc.can_save_incrementally():
+                    doc.saveIncr()
+                    self.prepared = None
+                else:
+                    # E.g. repaired files - fall back to a full rewrite
+                    self.prepared = doc.tobytes(garbage=2, deflate=True)
+            finally:
+                doc.close()
+            if self.prepared is None:
+                with open(work_path, 'rb') as f:
+                    self.prepared = f.read()
+        finally:
+            os.remove(work_path)
+
+    def _prepare(self, doc, text_boxes):
+        static = []
+        for page_num in sorted(text_boxes):
+            page_boxes = text_boxes[page_num]
+            if page_num >= len(doc):
+                print(f"Skipping {len(page_boxes)} text boxes on page {page_num + 1}: "
+                      f"document has {len(doc)} pages", file=sys.stderr)
+                continue
+            page = doc[page_num]
+            PDFExporter.unshare_resources(doc, page)
+
+            fixed = [tb for tb in page_boxes if not merge_placeholders(tb.get('text'))]
+            merged = [tb for tb in page_boxes if merge_placeholders(tb.get('text'))]
+            if fixed:
+                static.append((page_num, {'text_boxes': fixed, 'images': []}))
+            if merged:
+                for tb_dict in merged:
+                    self.fields |= merge_placeholders(tb_dict['text'])
+                self._slots[page_num] = (None, merged)
+
+        NativeOverlayBackend().apply(doc, static)
+
+        for page_num, (_, merged) in self._slots.items():
+            page = doc[page_num]
+            page.wrap_contents()
+            for tb_dict in merged:
+                page.insert_font(fontname=NativeOverlayBackend.font_name(
+                    tb_dict.get('font_family', 'Helvetica')))
+            self._slots[page_num] = (self._reserve_stream(doc, page), merged)
+
+    @staticmethod
+    def _reserve_stream(doc, page):
+        """Append an empty content stream to page; return its xref."""
+        xref = doc.get_new_xref()
+        doc.update_object(xref, "<<>>")
+        doc.update_stream(xref, b" ")
+        contents = page.get_contents() + [xref]
+        doc.xref_set_key(page.xref, "Contents",
+                         "[" + " ".join(f"{c} 0 R" for c in contents) + "]")
+        return xref
+
+    @property
+    def pages(self):
+        """Page numbers with placeholder text boxes."""
+        return sorted(self._slots)
+
+    def missing_columns(self, columns):
+        """Placeholders that have no column in the data."""
+        return sorted(self.fields - set(columns))
+
+    def render(self, row, output_path):
+        """Write the document filled with one data row to output_path."""
+        with open(output_path, 'wb') as f:
+            f.write(self.prepared)
+        doc = fitz.open(output_path)
+        try:
+            for page_num, (xref, merged) in self._slots.items():
+                shape = doc[page_num].new_shape()
+                for tb_dict in merged:
+                    NativeOverlayBackend.draw_text_box(
+                        shape, tb_dict, merge_substitute(tb_dict['text'], row))
+                # The stream sits inside the q/Q wrap made by _prepare
+                doc.update_stream(xref, shape.text_cont.encode())
+            doc.saveIncr()
+        finally:
+            doc.close()
+
+
+_merge_template = None  # MergeTemplate of this worker process
+
+
+def merge_worker_init(template):
+    global _merge_template
+    _merge_template = template
+
+
+def merge_rows(tasks, template=None):
+    """Render [(index, row, output_path), ...]; never raises.
+
+    Runs in a merge worker (using its template) or in-process.
+    """
+    template = template or _merge_template
+    results = []
+    for index, row, output_path in tasks:
+        start = time.perf_counter()
+        result = {'index': index, 'output': output_path, 'ok': False, 'error': None}
+        try:
+            template.render(row, output_path)
+            result['ok'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            result['traceback'] = traceback.format_exc()
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def run_merge(template, rows, output_paths, workers=None, progress=None):
+    """Render one output per row; return results in row order.
+
+    Rows go to the workers in chunks of MERGE_CHUNK_ROWS; workers=1 renders
+    in this process. progress(done, total, result) is called per row.
+    """
+    tasks = list(zip(range(1, len(rows) + 1), rows, output_paths))
+    workers = max(1, min(workers or BATCH_WORKERS, len(tasks) or 1))
+    results = [None] * len(tasks)
+    done = 0
+
+    def collect(chunk_results):
+        nonlocal done
+        for result in chunk_results:
+            INSTRUMENTATION.record("merge.row", result['seconds'])
+            results[result['index'] - 1] = result
+            done += 1
+            if progress:
+                progress(done, len(tasks), result)
+
+    if workers == 1:
+        for task in tasks:
+            collect(merge_rows([task], template))
+        return results
+
+    chunk_rows = max(1, min(MERGE_CHUNK_ROWS, len(tasks) // (workers * 4) or 1))
+    chunks = [tasks[i:i + chunk_rows] for i in range(0, len(tasks), chunk_rows)]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=merge_worker_init,
+        initargs=(template,)
+    ) as executor:
+        futures = {executor.submit(merge_rows, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                chunk_results = future.result()
+            except Exception as e:
+                # Worker died (e.g. crashed inside MuPDF)
+                chunk_results = [
+                    {'index': index, 'output': output_path, 'ok': False,
+                     'error': f"{type(e).__name__}: {e}", 'seconds': 0.0}
+                    for index, _, output_path in futures[future]
+                ]
+            collect(chunk_results)
+    return results
+
+
+def merge_main(argv):
+    """Command line entry point: one filled PDF per data row."""
+    parser = argparse.ArgumentParser(
+        prog="pdf_editor_with_textboxes.py merge",
+        description="Fill {{column}} placeholders in text boxes from each row of a "
+                    "CSV or JSON data file, writing one PDF per row."
+    )
+    parser.add_argument("source", help="template PDF")
+    parser.add_argument("layout", help=".csv or .json text boxes with {{column}} placeholders")
+    parser.add_argument("data", help=".csv with a header row, or a JSON list of objects")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for the outputs")
+    parser.add_argument("--name", default=None,
+                        help="output file name pattern, e.g. \"{{name}}.pdf\" "
+                             "({{_row}} is the row number; default <source>_{{_row}}.pdf)")
+    parser.add_argument("-j", "--workers", type=int, default=BATCH_WORKERS,
+                        help=f"worker processes (default {BATCH_WORKERS})")
+    parser.add_argument("--report", help="write per-row results to this JSON file")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only report failures")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = read_merge_rows(args.data)
+        template = MergeTemplate(args.source, read_text_box_fields(args.layout))
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    columns = set().union(*(row.keys() for row in rows)) if rows else set()
+    missing = template.missing_columns(columns)
+    if missing:
+        print(f"Error: no data column for placeholders: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    if not template.fields:
+        print("Warning: the layout has no {{column}} placeholders", file=sys.stderr)
+
+    stem = os.path.splitext(os.path.basename(args.source))[0]
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_paths = merge_output_names(args.name or f"{stem}_{{{{_row}}}}.pdf",
+                                      rows, args.output_dir)
+
+    def progress(done, total, result):
+        if result['ok']:
+            if not args.quiet:
+                print(f"[{done}/{total}] ok   row {result['index']} -> {result['output']} "
+                      f"({result['seconds'] * 1000:.0f} ms)", flush=True)
+        else:
+            print(f"[{done}/{total}] FAIL row {result['index']}: {result['error']}",
+                  file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    results = run_merge(template, rows, output_paths, workers=args.workers, progress=progress)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r['ok']]
+    rate = len(results) / elapsed if elapsed else 0.0
+    print(f"Merged {len(results) - len(failed)}/{len(results)} rows in {elapsed:.1f}s "
+          f"({rate:.1f} rows/s, {len(failed)} failed)")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    return 1 if failed else 0
+
 
 # ==================== Application Entry ====================
 def main():
+    # Headless subcommands
+    commands = {"batch": batch_main, "import": import_main, "fill": fill_main,
+                "merge": merge_main}
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        status = commands[sys.argv[1]](sys.argv[2:])
+        report = INSTRUMENTATION.write_report()
+        if report:
+            print(f"Profile written to {report}", file=sys.stderr)
+        sys.exit(status)
+
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
 